@@ -0,0 +1,126 @@
+"""
+Write throughput of the article tables: old per-row path vs batch API.
+
+The old path is the pre-batch code: a fresh connection, one INSERT
+(duplicates detected through IntegrityError) and one commit per article,
+then one UPDATE + commit per fetched article. The new path uses
+upsert_articles and update_articles_full_data on the tuned connection.
+
+    python benchmarks/bench_db_writes.py
+    python benchmarks/bench_db_writes.py --articles 10000 --batch-size 25
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import src.database as database
+
+def synthetic_articles(n):
+    articles = [{"id": f"74-{i}", "name": f"Otsikko {i}", "url": f"https://yle.fi/a/74-{i}"} for i in range(n)]
+    details = [{
+        "id": a["id"],
+        "content": "Kappale tekstiä. " * 150,
+        "description": f"Kuvaus {a['id']}",
+        "keywords": "Kotimaa, Politiikka, Talous",
+        "published_date": "2024-05-01T10:00:00+03:00",
+    } for a in articles]
+    return articles, details
+
+def use_database(path):
+    database.close_db_connections()
+    database.DB_PATH = path
+    database.init_db()
+    database.upgrade_db_schema()
+    database.close_db_connections()
+
+def old_path(path, journalist_id, articles, details, feed_batch):
+    # the old code ran on SQLite defaults (rollback journal, synchronous=FULL)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = DELETE")
+    conn.close()
+
+    start = time.perf_counter()
+    for i in range(0, len(articles), feed_batch):
+        conn = sqlite3.connect(path)
+        cursor = conn.cursor()
+        for article in articles[i:i + feed_batch]:
+            try:
+                cursor.execute(
+                    "INSERT INTO articles (id, title, url, journalist_id) VALUES (?, ?, ?, ?)",
+                    (article['id'], article['name'], article['url'], journalist_id)
+                )
+            except sqlite3.IntegrityError:
+                pass
+        conn.commit()
+        conn.close()
+    insert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for row in details:
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "UPDATE articles SET content = ?, description = ?, keywords = ?, published_date = ? WHERE id = ?",
+            (row['content'], row['description'], row['keywords'], row['published_date'], row['id'])
+        )
+        conn.commit()
+        conn.close()
+    update_time = time.perf_counter() - start
+    return insert_time, update_time
+
+def new_path(journalist_id, articles, details, feed_batch, write_batch):
+    start = time.perf_counter()
+    for i in range(0, len(articles), feed_batch):
+        database.upsert_articles(journalist_id, articles[i:i + feed_batch])
+    insert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(0, len(details), write_batch):
+        database.update_articles_full_data(details[i:i + write_batch])
+    update_time = time.perf_counter() - start
+    return insert_time, update_time
+
+def check_upsert_counts(journalist_id):
+    """upsert_articles counts must not include rows written by the search index/stats triggers."""
+    articles = [{"id": f"check-{i}", "name": f"Otsikko {i}", "url": f"https://yle.fi/a/check-{i}"} for i in range(5)]
+    inserted, updated = database.upsert_articles(journalist_id, articles)
+    assert (len(inserted), updated) == (5, 0), (len(inserted), updated)
+    inserted, updated = database.upsert_articles(journalist_id, articles)
+    assert (len(inserted), updated) == (0, 0), (len(inserted), updated)
+    articles[0]["name"] = "Uusi otsikko"
+    inserted, updated = database.upsert_articles(journalist_id, articles + [{"id": "check-new", "name": "Uusi", "url": "https://yle.fi/a/check-new"}])
+    assert (len(inserted), updated) == (1, 1), (len(inserted), updated)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=10000)
+    parser.add_argument("--feed-batch", type=int, default=25, help="articles per feed batch (save_articles call)")
+    parser.add_argument("--batch-size", type=int, default=25, help="detail rows per write transaction")
+    args = parser.parse_args()
+
+    articles, details = synthetic_articles(args.articles)
+    n = len(articles)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old_db = os.path.join(tmp, "old.db")
+        use_database(old_db)
+        old_insert, old_update = old_path(old_db, "56-0-0", articles, details, args.feed_batch)
+
+        new_db = os.path.join(tmp, "new.db")
+        use_database(new_db)
+        new_insert, new_update = new_path("56-0-0", articles, details, args.feed_batch, args.batch_size)
+        check_upsert_counts("56-0-1")
+        database.close_db_connections()
+
+    print(f"{n} synthetic articles, feed batches of {args.feed_batch}, detail writes in groups of {args.batch_size}\n")
+    print(f"{'path':<10} {'insert rows/s':>14} {'update rows/s':>14}")
+    print(f"{'old':<10} {n / old_insert:>14,.0f} {n / old_update:>14,.0f}")
+    print(f"{'batch':<10} {n / new_insert:>14,.0f} {n / new_update:>14,.0f}")
+    print(f"\nspeedup: insert x{old_insert / new_insert:.1f}, update x{old_update / new_update:.1f}")
+
+if __name__ == "__main__":
+    main()
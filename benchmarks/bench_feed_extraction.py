@@ -0,0 +1,184 @@
+"""
+Per-batch cost of feed card extraction as the profile feed grows.
+
+Compares the old approach (BeautifulSoup over the whole page source after
+every "Näytä lisää" click) with extract_new_feed_cards, which only sends
+back the cards appended since the previous batch.
+
+    python benchmarks/bench_feed_extraction.py                    # synthetic feed, no browser
+    python benchmarks/bench_feed_extraction.py --browser          # static feed page in headless Chrome
+    python benchmarks/bench_feed_extraction.py --live 56-74-1533  # real profile (Chrome)
+
+The synthetic mode never runs NEW_CARDS_SCRIPT: its fake driver slices a
+Python list, so its "new cards" column only measures the Python-side
+overhead and is flat by construction. --browser runs the real script,
+which only looks at the feed list's newly appended children; its page
+also has card links after the feed, which must not be picked up.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.scraper import extract_new_feed_cards, get_driver
+
+CARD_TEMPLATE = """
+<li class="feed-item">
+  <article class="card">
+    <div class="card__image"><img src="https://images.cdn.yle.fi/{i}.jpg" alt=""></div>
+    <div class="card__body">
+      <h3><a href="/a/74-{i}" data-card-heading-content-id="74-{i}">Artikkelin otsikko numero {i}</a></h3>
+      <p class="card__lead">Lyhyt ingressi artikkelista {i}, joka kertoo mistä on kyse.</p>
+      <span class="card__meta"><time datetime="2024-01-01">1.1.2024</time> Kotimaa</span>
+    </div>
+  </article>
+</li>
+"""
+
+PAGE_CHROME = "<header>" + "<nav><a href='#'>Linkki</a></nav>" * 200 + "</header>"
+
+# card links below the feed, outside its list
+RECOMMENDATIONS = "<aside><div>" + "".join(
+    f"<a href='/a/74-r{i}' data-card-heading-content-id='74-r{i}'>Suositeltu {i}</a>" for i in range(3)
+) + "</div></aside>"
+
+class FakeFeedDriver:
+    """Stands in for Selenium without a browser: holds a growing list of cards."""
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+        self.count = 0
+
+    def click_more(self):
+        self.count += self.batch_size
+
+    @property
+    def page_source(self):
+        cards = "".join(CARD_TEMPLATE.format(i=i) for i in range(self.count))
+        return f"<html><body>{PAGE_CHROME}<ul>{cards}</ul></body></html>"
+
+    def execute_script(self, script, offset, rescan=False):
+        # NEW_CARDS_SCRIPT is not run: only the cards it would return are
+        # built, so the browser-side cost is not part of this measurement
+        start = 0 if rescan else offset
+        cards = [(f"74-{i}", f"Artikkelin otsikko numero {i}") for i in range(start, self.count)]
+        return {"total": self.count, "cards": cards}
+
+def legacy_extract(driver, processed_ids):
+    soup = BeautifulSoup(driver.page_source, 'html.parser')
+    links = soup.find_all('a', attrs={"data-card-heading-content-id": True})
+    new = []
+    for link in links:
+        a_id = link['data-card-heading-content-id']
+        if a_id not in processed_ids:
+            processed_ids.add(a_id)
+            new.append((a_id, link.get_text().strip()))
+    return new
+
+def run_synthetic(batches, batch_size):
+    driver = FakeFeedDriver(batch_size)
+    processed_ids = set()
+    offset = 0
+    rows = []
+    for batch in range(1, batches + 1):
+        driver.click_more()
+
+        start = time.perf_counter()
+        legacy_extract(driver, processed_ids)
+        legacy_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        _, offset = extract_new_feed_cards(driver, offset)
+        new_ms = (time.perf_counter() - start) * 1000
+
+        rows.append((batch, driver.count, legacy_ms, new_ms))
+    return rows
+
+def run_browser(batches, batch_size):
+    """Static feed page in headless Chrome; each batch appends cards like a "Näytä lisää" click."""
+    driver = get_driver(headless=True)
+    processed_ids = set()
+    offset = 0
+    count = 0
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        page = os.path.join(tmp, "feed.html")
+        with open(page, "w", encoding="utf-8") as f:
+            f.write(f"<html><body>{PAGE_CHROME}<ul id='feed'></ul>{RECOMMENDATIONS}</body></html>")
+        try:
+            driver.get("file://" + page)
+            for batch in range(1, batches + 1):
+                cards = "".join(CARD_TEMPLATE.format(i=i) for i in range(count, count + batch_size))
+                driver.execute_script("document.getElementById('feed').insertAdjacentHTML('beforeend', arguments[0]);", cards)
+                count += batch_size
+
+                start = time.perf_counter()
+                legacy_extract(driver, processed_ids)
+                legacy_ms = (time.perf_counter() - start) * 1000
+
+                start = time.perf_counter()
+                _, offset = extract_new_feed_cards(driver, offset)
+                new_ms = (time.perf_counter() - start) * 1000
+
+                rows.append((batch, count, legacy_ms, new_ms))
+        finally:
+            driver.quit()
+    return rows
+
+def run_live(profile_id, batches):
+    driver = get_driver(headless=True)
+    processed_ids = set()
+    offset = 0
+    rows = []
+    try:
+        driver.get(f"https://yle.fi/p/{profile_id}/fi")
+        time.sleep(2)
+        for batch in range(1, batches + 1):
+            start = time.perf_counter()
+            legacy_extract(driver, processed_ids)
+            legacy_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            _, offset = extract_new_feed_cards(driver, offset)
+            new_ms = (time.perf_counter() - start) * 1000
+
+            rows.append((batch, offset, legacy_ms, new_ms))
+            buttons = driver.find_elements("css selector", 'button[aria-label="Näytä lisää"]')
+            if not buttons:
+                break
+            driver.execute_script("arguments[0].click();", buttons[0])
+            time.sleep(1)
+    finally:
+        driver.quit()
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batches", type=int, default=40)
+    parser.add_argument("--batch-size", type=int, default=25)
+    parser.add_argument("--browser", action="store_true", help="run the real extraction script on a static page in headless Chrome")
+    parser.add_argument("--live", metavar="PROFILE_ID", help="benchmark against a real Yle profile")
+    args = parser.parse_args()
+
+    if args.live:
+        rows = run_live(args.live, args.batches)
+    elif args.browser:
+        rows = run_browser(args.batches, args.batch_size)
+    else:
+        rows = run_synthetic(args.batches, args.batch_size)
+        print("Synthetic feed: 'new cards' is Python-side overhead only, NEW_CARDS_SCRIPT is not run (see --browser).\n")
+
+    print(f"{'batch':>5} {'cards':>6} {'full reparse ms':>16} {'new cards ms':>13}")
+    for batch, cards, legacy_ms, new_ms in rows:
+        print(f"{batch:>5} {cards:>6} {legacy_ms:>16.2f} {new_ms:>13.2f}")
+
+    first, last = rows[0], rows[-1]
+    print(f"\nFull reparse: {first[2]:.2f} ms -> {last[2]:.2f} ms per batch")
+    print(f"New cards:    {first[3]:.2f} ms -> {last[3]:.2f} ms per batch")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Article parser backend benchmark.
+
+Runs parse_article_html with every backend in PARSER_BACKENDS over a
+directory of saved article HTML files, reports pages/second and checks
+that each backend extracts exactly what the html.parser reference does.
+
+    python benchmarks/bench_parsers.py                 # uses the HTML cache
+    python benchmarks/bench_parsers.py --dir saved_pages/ --repeat 3
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config import HTML_CACHE_DIR
+from src.scraper import PARSER_BACKENDS, parse_article_html
+
+REFERENCE_BACKEND = "html.parser"
+
+def load_pages(directory):
+    paths = sorted(glob.glob(os.path.join(directory, "**", "*.html"), recursive=True))
+    pages = []
+    for path in paths:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            pages.append((path, f.read()))
+    return pages
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", default=HTML_CACHE_DIR, help="directory of saved article .html files")
+    parser.add_argument("--repeat", type=int, default=1, help="passes over the directory per backend")
+    args = parser.parse_args()
+
+    pages = load_pages(args.dir)
+    if not pages:
+        print(f"No .html files found in {args.dir}")
+        return
+    total_mb = sum(len(html) for _, html in pages) / 1024 / 1024
+    print(f"{len(pages)} pages ({total_mb:.1f} MB) from {args.dir}\n")
+
+    reference = {path: parse_article_html(html, REFERENCE_BACKEND) for path, html in pages}
+
+    print(f"{'backend':<22} {'pages/s':>9} {'MB/s':>7} {'mismatches':>11}")
+    for backend in PARSER_BACKENDS:
+        try:
+            results = {path: parse_article_html(html, backend) for path, html in pages}
+        except Exception as e:
+            print(f"{backend:<22} unavailable ({e})")
+            continue
+        mismatches = [path for path in results if results[path] != reference[path]]
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for _, html in pages:
+                parse_article_html(html, backend)
+        elapsed = time.perf_counter() - start
+
+        pages_per_sec = len(pages) * args.repeat / elapsed
+        mb_per_sec = total_mb * args.repeat / elapsed
+        print(f"{backend:<22} {pages_per_sec:>9.1f} {mb_per_sec:>7.2f} {len(mismatches):>11}")
+        for path in mismatches[:5]:
+            print(f"    differs: {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Dashboard cold start: import cost and time to first paint of the article table.
+
+Runs `python -X importtime -c "import dashboard.app"` in a fresh
+interpreter, lists the heaviest imports and checks that none of the
+deferred dependencies (RAG stack, Selenium, charting) load at startup.
+Then, in another fresh interpreter, times import + the queries behind
+the first article table page against FIRST_PAINT_TARGET_MS.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --top 20 --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Article table on screen within this long of a cold start (excluding
+# interpreter start-up and the browser round trip)
+FIRST_PAINT_TARGET_MS = 1500
+
+# Must not be imported until the feature that needs them is used
+DEFERRED_MODULES = [
+    "langchain_core", "langchain_community", "chromadb", "sentence_transformers", "torch",
+    "selenium", "webdriver_manager", "bs4", "matplotlib",
+]
+
+FIRST_PAINT_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import dashboard.app as app
+imported = time.perf_counter()
+app.ensure_db()
+journalists = app.get_journalist_stats()
+if journalists:
+    app.get_articles_published_between(journalists[0]['id'], limit=app.ARTICLE_PAGE_SIZE)
+done = time.perf_counter()
+deferred = [m for m in sys.argv[1:] if m in sys.modules]
+print(f"{(imported - start) * 1000}|{(done - start) * 1000}|{','.join(deferred)}")
+"""
+
+def import_times():
+    """Returns [(module, self_us, cumulative_us)] from -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import dashboard.app"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+def first_paint():
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_PAINT_SCRIPT, *DEFERRED_MODULES],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    import_ms, paint_ms, deferred = result.stdout.strip().splitlines()[-1].split("|")
+    return float(import_ms), float(paint_ms), [m for m in deferred.split(",") if m]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=10, help="heaviest top-level packages to list")
+    parser.add_argument("--runs", type=int, default=3, help="cold starts to time")
+    args = parser.parse_args()
+
+    rows = import_times()
+    total = next((cumulative for name, _, cumulative in rows if name == "dashboard.app"), 0)
+    packages = sorted((row for row in rows if "." not in row[0]), key=lambda row: -row[2])
+    print(f"import dashboard.app: {total / 1000:.0f} ms cumulative\n")
+    print(f"{'package':<28} {'cumulative ms':>14}")
+    for name, _, cumulative in packages[:args.top]:
+        print(f"{name:<28} {cumulative / 1000:>14.1f}")
+
+    imported = {name.split(".")[0] for name, _, _ in rows}
+    loaded = [m for m in DEFERRED_MODULES if m in imported]
+    print(f"\ndeferred modules loaded at startup: {', '.join(loaded) or 'none'}")
+
+    runs = [first_paint() for _ in range(args.runs)]
+    import_ms = statistics.median(run[0] for run in runs)
+    paint_ms = statistics.median(run[1] for run in runs)
+    verdict = "OK" if paint_ms <= FIRST_PAINT_TARGET_MS else "OVER TARGET"
+    print(f"\ncold start (median of {args.runs}): import {import_ms:.0f} ms, "
+          f"first table page {paint_ms:.0f} ms, target {FIRST_PAINT_TARGET_MS} ms -> {verdict}")
+
+if __name__ == "__main__":
+    main()
@@ -1,50 +1,104 @@
 import streamlit as st # type: ignore
-import sqlite3
 import pandas as pd
 import sys
 import random
 import os
 import re
-import matplotlib.pyplot as plt
-import matplotlib.patheffects as pe
-import plotly.graph_objects as go # type: ignore
+import datetime
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.config import DB_PATH, COLORS
-from main import run_scraper_pipeline
-from mock_utils import generate_mock_analytics
+from src.config import DASHBOARD_SETTINGS, DISPLAY_TZ
+from src.database import (
+    ensure_db, open_read_connection, set_shared_read_connection, get_journalist_stats, get_journalists_version,
+    search_articles, count_search_matches, get_published_range, get_articles_published_between, count_articles_published_between
+)
+from dashboard.charts import article_stats, chart_cache_ts, render_article_charts
 from dashboard.rag_ui import render_rag_ui
+from dashboard.scrape_ui import submit_scrape, render_scrape_progress
+from dashboard.rollups import render_journalist_overview
 
 # --- Page Config ---
 st.set_page_config(page_title="Yle Journalist Dashboard", page_icon="📰", layout="wide")
 
 # --- Helper Functions ---
-@st.cache_data
-def load_data():
-    conn = sqlite3.connect(DB_PATH)
-    query = """
-    SELECT 
-        a.title,
-        a.published_date,
-        a.url,
-        length(a.content) as char_count,
-        a.keywords,
-        j.name as journalist_name,
-        a.journalist_id
-    FROM articles a
-    LEFT JOIN journalists j ON a.journalist_id = j.id
-    """
+# Streamlit runs every rerun (and every progress poll) on a new thread, so
+# thread-local connections would be reopened all the time. All sessions
+# share this one read-only connection instead.
+@st.cache_resource
+def get_shared_read_connection():
+    return open_read_connection(check_same_thread=False)
+
+# Cached loaders take a `version` argument that is part of the cache key:
+# the journalist list uses get_journalists_version(), per-journalist data
+# that journalist's journalist_stats.version. A scrape only bumps the
+# versions it touched, so every other cached entry stays valid.
+@st.cache_data(max_entries=20)
+def load_journalists(version):
+    """Journalists with their header stats, read from the small journalist_stats table."""
     try:
-        df = pd.read_sql_query(query, conn)
-        conn.close()
-        return df
+        return pd.DataFrame(get_journalist_stats())
     except Exception as e:
         st.error(f"SQL Error: {e}")
-        conn.close()
         return pd.DataFrame()
 
+ARTICLE_PAGE_SIZE = 50
+ARTICLE_COLUMNS = ['id', 'title', 'url', 'published_date', 'published_ts', 'char_count', 'keywords', 'journalist_id']
+
+def articles_frame(rows, columns=ARTICLE_COLUMNS):
+    articles = pd.DataFrame(rows, columns=columns)
+    articles['published'] = pd.to_datetime(articles['published_ts'], unit='s', utc=True).dt.tz_convert(DISPLAY_TZ)
+    return articles
+
+@st.cache_data(max_entries=200)
+def load_articles(journalist_id, version, start_ts=None, end_ts=None, page=0):
+    """One page of a journalist's articles; date range and paging run in SQL."""
+    return articles_frame(get_articles_published_between(
+        journalist_id, start_ts, end_ts, limit=ARTICLE_PAGE_SIZE, offset=page * ARTICLE_PAGE_SIZE
+    ))
+
+@st.cache_data(max_entries=200)
+def count_articles(journalist_id, version, start_ts=None, end_ts=None):
+    return count_articles_published_between(journalist_id, start_ts, end_ts)
+
+SEARCH_RESULT_LIMIT = 200
+
+@st.cache_data(max_entries=50)
+def load_search_results(query, journalist_id, version, start_ts=None, end_ts=None):
+    hits = search_articles(query, journalist_id, limit=SEARCH_RESULT_LIMIT, start=start_ts, end=end_ts)
+    return articles_frame(hits, ARTICLE_COLUMNS + ['snippet'])
+
+@st.cache_data(max_entries=50)
+def count_search_results(query, journalist_id, version, start_ts=None, end_ts=None):
+    return count_search_matches(query, journalist_id, start_ts, end_ts)
+
+@st.cache_data(max_entries=200)
+def load_published_range(journalist_id, version):
+    return get_published_range(journalist_id)
+
+def local_date(ts):
+    """The DISPLAY_TZ calendar date of an epoch timestamp, as shown in the article table."""
+    return pd.Timestamp(ts, unit='s', tz='UTC').tz_convert(DISPLAY_TZ).date()
+
+def local_midnight_ts(day):
+    """Epoch seconds of midnight at the start of `day` in DISPLAY_TZ."""
+    return int(pd.Timestamp(day, tz=DISPLAY_TZ).timestamp())
+
+def date_range_filter(journalist_id, version):
+    """Sidebar slider over the journalist's publish dates. Returns (start_ts, end_ts), None = open."""
+    published_range = load_published_range(journalist_id, version)
+    if not published_range:
+        return None, None
+    first, last = (local_date(ts) for ts in published_range)
+    if first >= last:
+        return None, None
+    start, end = st.sidebar.slider("Published between", min_value=first, max_value=last, value=(first, last), format="DD.MM.YYYY")
+    start_ts = local_midnight_ts(start) if start > first else None
+    # end is inclusive in the slider, exclusive in SQL
+    end_ts = local_midnight_ts(end + datetime.timedelta(days=1)) if end < last else None
+    return start_ts, end_ts
+
 def extract_id_from_url(url):
     match = re.search(r'56-\d+-\d+', url)
     if match:
@@ -53,6 +107,9 @@ def extract_id_from_url(url):
     
 # --- Main Dashboard ---
 def main():
+    # Create/upgrade the schema once per server process
+    ensure_db()
+    set_shared_read_connection(get_shared_read_connection())
     st.markdown(
         """
         <style>
@@ -81,6 +138,8 @@ def main():
             st.write("") # Spacer
             st.write("") 
             scrape_all = st.checkbox("All")
+        
+        only_new = st.checkbox("Only new articles", help="Stop once the scraper reaches articles that are already saved.")
             
         # Warning Logic
         if scrape_all or article_limit > 10:
@@ -91,48 +150,38 @@ def main():
             if new_url:
                 profile_id = extract_id_from_url(new_url)
                 if profile_id:
-                    with st.status("Running...", expanded=True) as status:
-                        try:
-                            # Determine max limit (inf if All)
-                            limit_arg = float('inf') if scrape_all else article_limit
-                            
-                            st.write(f"Scraping (Target: {limit_arg})...")
-                            name, count = run_scraper_pipeline(profile_id, max_articles=limit_arg) # type: ignore
-                            
-                            status.update(label=f"Done! Added {name}", state="complete", expanded=False)
-                            
-                            # 4. Success & Auto-Select Logic
-                            st.session_state['last_added_journalist'] = name
-                            st.success(f"Successfully added {name} ({count} articles)")
-                            
-                            # Clear cache and reload to show new data
-                            st.cache_data.clear()
-                            st.rerun()
-                            
-                        except Exception as e:
-                            st.error(f"Error: {e}")
+                    # Determine max limit (inf if All)
+                    limit_arg = float('inf') if scrape_all else article_limit
+                    # Runs in the background, the dashboard stays usable meanwhile
+                    job_id = submit_scrape(profile_id, limit_arg, incremental=only_new)
+                    st.success(f"Scrape queued (job #{job_id}, target: {limit_arg}).")
                 else:
                     st.error("Invalid URL. Look for '56-74-...' in the link.")
 
+        render_scrape_progress()
+
     # --- MAIN CONTENT ---
     try:
-        df = load_data()
+        journalists_df = load_journalists(get_journalists_version())
     except Exception as e:
         st.error(f"Database error: {e}")
         return
 
-    if df.empty:
+    if not journalists_df.empty:
+        journalists_df = journalists_df[journalists_df['article_count'] > 0]
+    if journalists_df.empty:
         st.warning("Database is empty. Add a journalist using the sidebar!")
         return
 
     # Sidebar Filter
     st.sidebar.divider()
     st.sidebar.header("Filters")
-    journalist_list = df['journalist_name'].unique().tolist()
+    journalist_list = journalists_df['name'].unique().tolist()
     journalist_list = [x for x in journalist_list if x is not None]
     
     j_id = None
     selected_journalist = None
+    journalist_stats = None
     
     # Auto-Select Logic implementation
     # We check if a new journalist was just added and if they exist in the list
@@ -148,255 +197,126 @@ def main():
             journalist_list, 
             index=default_index
         )
-        filtered_df = df[df['journalist_name'] == selected_journalist]
-        j_id = filtered_df['journalist_id'].iloc[0] if not filtered_df.empty else "N/A"
+        journalist_rows = journalists_df[journalists_df['name'] == selected_journalist]
+        journalist_stats = journalist_rows.iloc[0] if not journalist_rows.empty else None
+        j_id = journalist_stats['id'] if journalist_stats is not None else "N/A"
+        j_version = int(journalist_stats['version']) if journalist_stats is not None else 0
+        start_ts, end_ts = date_range_filter(j_id, j_version)
+        plotly_only = st.sidebar.toggle(
+            "Fast charts (Plotly only)", value=DASHBOARD_SETTINGS['chart_renderer'] == "plotly",
+            help="Draw every chart in the browser instead of rendering Matplotlib images on the server."
+        )
         profile_url = f"https://yle.fi/p/{j_id}/fi" if j_id != "N/A" else "N/A"
         st.title(f"🪪 {selected_journalist}")   # Update title with name of journalist
         st.caption(f"**Profile URL:** {profile_url}")
     else:
         st.warning("No journalists found in DB.")
-        filtered_df = df
+        return
 
-    # Display Metrics
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.metric("Total Articles (in database)", len(filtered_df))
-    with col2:
-        if not filtered_df.empty:
-            avg_len = filtered_df['char_count'].mean()
-            st.metric("Avg Article Length", f"{int(avg_len)} chars")
-    with col3:
-        if 'published_date' in filtered_df.columns and not filtered_df['published_date'].isnull().all():
-            latest = filtered_df['published_date'].max()
-            if latest:
-                st.metric("Latest Article", latest[:10])
+    # Display Metrics (precomputed in journalist_stats)
+    if journalist_stats is not None:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Total Articles (in database)", int(journalist_stats['article_count']))
+        with col2:
+            if pd.notna(journalist_stats['avg_chars']):
+                st.metric("Avg Article Length", f"{int(journalist_stats['avg_chars'])} chars")
+        with col3:
+            if pd.notna(journalist_stats['latest_ts']):
+                latest = pd.Timestamp(int(journalist_stats['latest_ts']), unit='s', tz='UTC').tz_convert(DISPLAY_TZ)
+                st.metric("Latest Article", latest.strftime("%Y-%m-%d"))
     st.divider()
 
     # --- INTERACTIVE DATA TABLE ---
-    if not filtered_df.empty:
-        st.subheader("📰Articles:")
-        st.info("💡 Click the boxes on the left to view detailed analytics.")
+    if start_ts is None and end_ts is None:
+        total_articles = int(journalist_stats['article_count'])
+    else:
+        total_articles = count_articles(j_id, j_version, start_ts, end_ts)
+
+    if total_articles:
+        # with on_change="rerun" only the open tab is built, so the overview
+        # (all of the journalist's articles) costs nothing until it is opened
+        articles_tab, overview_tab = st.tabs(["📰 Articles", "📈 Journalist Overview"], key="view_tabs", on_change="rerun")
+        if articles_tab.open:
+            with articles_tab:
+                search_query = st.text_input("🔎 Search articles", placeholder="e.g. vaalit, ilmasto")
+                if search_query:
+                    # Full-text search runs in SQLite, results come back best match first
+                    filtered_df = load_search_results(search_query, j_id, j_version, start_ts, end_ts)
+                    match_count = count_search_results(search_query, j_id, j_version, start_ts, end_ts)
+                    if match_count > len(filtered_df):
+                        st.caption(f"{match_count} articles match “{search_query}”, showing the best {len(filtered_df)}")
+                    else:
+                        st.caption(f"{match_count} articles match “{search_query}”")
+                else:
+                    # Only the visible page is loaded and sent to the browser
+                    page_count = (total_articles - 1) // ARTICLE_PAGE_SIZE + 1
+                    page = 1
+                    if page_count > 1:
+                        # keyed by journalist and range so switching either starts from page 1
+                        page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, step=1,
+                                               key=f"page_{j_id}_{start_ts}_{end_ts}")
+                    filtered_df = load_articles(j_id, j_version, start_ts, end_ts, page - 1)
+                    first = (page - 1) * ARTICLE_PAGE_SIZE + 1
+                    st.caption(f"Showing {first}–{first + len(filtered_df) - 1} of {total_articles} articles")
+                st.info("💡 Click the boxes on the left to view detailed analytics.")
         
-        max_char_count = int(filtered_df['char_count'].max()) if not filtered_df.empty else 10000
-
-        selection = st.dataframe(
-            filtered_df[['title', 'url', 'published_date', 'char_count', 'keywords']],
-            column_config={
-                "title": st.column_config.TextColumn("Title", width="large"),
-                "url": st.column_config.LinkColumn("Link", width=20),
-                "published_date": st.column_config.DateColumn(
-                    "Published", format="DD.MM.YYYY", width=20),
-                "char_count": st.column_config.NumberColumn(
-                    "Length", format="%d", width=20),
-                "keywords": st.column_config.TextColumn("Keywords", width="medium"),
-            },
-            use_container_width=True,
-            hide_index=True,
-            on_select="rerun", 
-            selection_mode="single-row"
-        )
-        # autoselect top row by default
-        if selection.selection.rows:
-            selected_index = selection.selection.rows[0]
-        else:
-            selected_index = 0
-
-        # check bounds to ensure dataframe isn't empty
-        if selected_index < len(filtered_df):
-            selected_article = filtered_df.iloc[selected_index]
-            
-            # Generate Mock Stats
-            stats = generate_mock_analytics(selected_article['url'])
-            
-            # --- ANALYTICS SECTION ---
-            st.markdown("---")
-            st.subheader("📊 Analytics:")
-            st.subheader(f'“{selected_article["title"]}”')
-            
-            # Row 1: Key Metrics
-            m1, m2, m3 = st.columns(3)
-            m1.metric("Total Views", f"{stats['views']:,}", delta=f"{random.randint(-10,10)}% vs avg")
-            m2.metric("Avg Read Time", f"{stats['read_time']:.1f} min", delta=f"{random.randint(-20,20)}% vs avg")
-            m3.metric("Conversion Rate", f"{stats['conversions']:.1f}%", delta=f"{random.randint(-5,5)}% vs avg")
-            
-            # Row 2: Charts
-            c1, c2, c3 = st.columns([2, 2, 1])
-
-            # Visual parameters
-            FIGSIZE = (2.2, 2.2)   # small square for pies
-            BAR_FIG = (1.1, 2.2)   # narrow + same height as pies
-            DPI = 160             # increase DPI for crisper text
-            FONT_SIZE = 6         # slightly larger for readability
-
-            plt.rcParams.update({
-                "font.family": "serif",
-                "text.antialiased": True,
-                "font.size": FONT_SIZE,
-            })
-
-            # Helper: small stroke for better legibility on colored backgrounds
-            stroke = [pe.withStroke(linewidth=2, foreground="black", alpha=0.6)]
-
-            # --- CHART 1: AGE ---
-            with c1:
-                st.write("**Reader Age Distribution**")
-                age_df = stats["age_data"]
-
-                fig, ax = plt.subplots(figsize=FIGSIZE, dpi=DPI)
-
-                def make_autopct(values, labels):
-                    def autopct(pct):
-                        idx = autopct.idx # type: ignore
-                        label = labels[idx]
-                        autopct.idx += 1 # type: ignore
-                        return f"{label}\n{pct:.1f}%"
-                    autopct.idx = 0 # type: ignore
-                    return autopct
-
-                wedges, _, autotexts = ax.pie(
-                    age_df["Readers"],
-                    startangle=90,
-                    colors=COLORS,
-                    autopct=make_autopct(age_df["Readers"].tolist(), age_df["Age Group"].tolist()),
-                    pctdistance=0.72,
-                    wedgeprops=dict(width=0.47, edgecolor="white"),
-                    textprops={'fontsize': FONT_SIZE}
+                table_columns = ['title', 'url', 'published', 'char_count', 'keywords']
+                if 'snippet' in filtered_df.columns:
+                    table_columns.insert(1, 'snippet')
+
+                selection = st.dataframe(
+                    filtered_df[table_columns],
+                    column_config={
+                        "title": st.column_config.TextColumn("Title", width="large"),
+                        "snippet": st.column_config.TextColumn("Match", width="large"),
+                        "url": st.column_config.LinkColumn("Link", width=20),
+                        "published": st.column_config.DateColumn(
+                            "Published", format="DD.MM.YYYY", width=20),
+                        "char_count": st.column_config.NumberColumn(
+                            "Length", format="%d", width=20),
+                        "keywords": st.column_config.TextColumn("Keywords", width="medium"),
+                    },
+                    use_container_width=True,
+                    hide_index=True,
+                    on_select="rerun", 
+                    selection_mode="single-row"
                 )
+                # autoselect top row by default
+                if selection.selection.rows:
+                    selected_index = selection.selection.rows[0]
+                else:
+                    selected_index = 0
 
-                for t in autotexts:
-                    t.set_color("white")
-                    t.set_path_effects(stroke) # type: ignore
-                    t.set_ha("center") # type: ignore
-                    t.set_va("center") # type: ignore
-
-                ax.axis("equal")
-                fig.tight_layout(pad=0.3)
-                fig.patch.set_alpha(0) # type: ignore
-                st.pyplot(fig, width='content')
-
-            # --- CHART 2: GENDER ---
-            with c2:
-                st.write("**Gender Distribution**")
-                g_data = stats["gender_data"]
-
-                fig2, ax2 = plt.subplots(figsize=FIGSIZE, dpi=DPI)
-                colors_gender = [COLORS[0], COLORS[3]]
-                wedges2, texts2, autotexts2 = ax2.pie(
-                    g_data['counts'],
-                    labels=g_data['labels'],
-                    autopct='%1.1f%%',
-                    startangle=140,
-                    colors=colors_gender,
-                    wedgeprops=dict(width=1, edgecolor='white'),
-                    textprops={'fontsize': FONT_SIZE},
-                    labeldistance=0.5,
-                    pctdistance=0.72
-                )
-                for t in texts2:
-                    t.set_color("white")
-                    t.set_path_effects(stroke) # type: ignore
-                    
-                for t in autotexts2:
-                    t.set_color("white")
-                    t.set_path_effects(stroke) # type: ignore
-
-                ax2.axis('equal')
-                fig2.tight_layout(pad=0.3)
-                fig2.patch.set_alpha(0) # type: ignore
-                st.pyplot(fig2, width='content')
-
-            # --- CHART 3: DEVICES ---
-            with c3:
-                st.write("**Device Split**")
-                dev_data = stats['device_data']
-                mobile = dev_data['Mobile']
-                desktop = dev_data['Desktop']
-                other = dev_data['Other']
-
-                fig3, ax3 = plt.subplots(figsize=BAR_FIG, dpi=DPI)
-
-                ax3.set_ylim(0, 100)
-                ax3.set_xlim(-0.5, 1.5)
-                ax3.axis('off')
-
-                # Colors: bottom -> other, middle -> desktop, top -> mobile
-                c_other = COLORS[1]
-                c_desktop = COLORS[2]
-                c_mobile = COLORS[3]
-
-                # Draw stacked bars bottom -> top
-                p_other = ax3.bar(0, other, width=0.5, color=c_other, edgecolor='white')
-                p_desktop = ax3.bar(0, desktop, width=0.5, bottom=other, color=c_desktop, edgecolor='white')
-                p_mobile = ax3.bar(0, mobile, width=0.5, bottom=other + desktop, color=c_mobile, edgecolor='white')
-
-                label_kwargs = dict(va='center', ha='left', fontsize=FONT_SIZE, color='white',
-                                    bbox=dict(facecolor='black', alpha=0.35, boxstyle='round,pad=0.2', edgecolor='none'))
-
-                t_other = ax3.text(0.62, other / 2, f"Other\n{other:.0f}%", **label_kwargs) # type: ignore
-                t_desktop = ax3.text(0.62, other + desktop / 2, f"Desktop\n{desktop:.0f}%", **label_kwargs) # type: ignore
-                t_mobile = ax3.text(0.62, other + desktop + mobile / 2, f"Mobile\n{mobile:.0f}%", **label_kwargs) # type: ignore
-
-                # Add the same stroke effect on the text artists (makes them pop)
-                for txt in (t_other, t_desktop, t_mobile):
-                    txt.set_path_effects(stroke) # type: ignore
-
-                fig3.tight_layout(pad=0.3)
-                fig3.patch.set_alpha(0) # type: ignore
-                st.pyplot(fig3, width='content')
-            
-            # --- Interactive time series chart ---
-            st.markdown("---")
-            st.subheader("📈 Traffic History")
+                # check bounds to ensure dataframe isn't empty
+                if selected_index < len(filtered_df):
+                    selected_article = filtered_df.iloc[selected_index]
             
-            # Get data
-            ts_df = stats['clicks_df']
+                    # Generate Mock Stats (cached per article, shared with the charts)
+                    stats = article_stats(selected_article['url'], chart_cache_ts(selected_article['published_ts']), datetime.date.today())
             
-            # Create Plotly Figure
-            fig = go.Figure()
+                    # --- ANALYTICS SECTION ---
+                    st.markdown("---")
+                    st.subheader("📊 Analytics:")
+                    st.subheader(f'“{selected_article["title"]}”')
             
-            # Add the Area Trace (The "Mountain")
-            fig.add_trace(go.Scatter(
-                x=ts_df['Date'],
-                y=ts_df['Views'],
-                mode='lines',
-                fill='tozeroy', # Fills area below the line
-                line=dict(color=COLORS[2], width=2), # Your theme green
-                name='Views'
-            ))
+                    # Row 1: Key Metrics (deltas seeded by URL so they don't change on rerun)
+                    delta_rng = random.Random(selected_article['url'])
+                    m1, m2, m3 = st.columns(3)
+                    m1.metric("Total Views", f"{stats['views']:,}", delta=f"{delta_rng.randint(-10,10)}% vs avg")
+                    m2.metric("Avg Read Time", f"{stats['read_time']:.1f} min", delta=f"{delta_rng.randint(-20,20)}% vs avg")
+                    m3.metric("Conversion Rate", f"{stats['conversions']:.1f}%", delta=f"{delta_rng.randint(-5,5)}% vs avg")
             
-            # Update Layout for "Bloomberg" Aesthetic
-            fig.update_layout(
-                paper_bgcolor='rgba(0,0,0,0)', # Transparent background
-                plot_bgcolor='rgba(0,0,0,0)',
-                margin=dict(l=0, r=0, t=0, b=0), # Remove whitespace
-                height=350,
-                hovermode="x unified", # Tooltip shows data for all lines at that x-position
-                
-                # The Axis Styling
-                xaxis=dict(
-                    showgrid=False, 
-                    showline=True, 
-                    linecolor='#333',
-                    rangeselector=dict(
-                        #bgcolor="#262730",
-                        activecolor=COLORS[2]
-                    ),
-                    rangeslider=dict(visible=True, thickness=0.1), # The Zoom Bar at bottom!
-                    type="date"
-                ),
-                yaxis=dict(
-                    showgrid=True, 
-                    gridcolor='#333', # Subtle grid lines
-                    zeroline=False
-                )
-            )
+                    # Row 2: Charts, rendered once per article and then served from cache
+                    render_article_charts(selected_article['url'], selected_article['published_ts'], plotly_only=plotly_only)
 
-            st.plotly_chart(fig, use_container_width=True)
-            
-               
-        # Success message underneath the table if just added
-        if 'last_added_journalist' in st.session_state and st.session_state['last_added_journalist'] == selected_journalist: # type: ignore
-            st.caption(f"✅ Displaying newly added data for {selected_journalist}") # type: ignore
+                # Success message underneath the table if just added
+                if 'last_added_journalist' in st.session_state and st.session_state['last_added_journalist'] == selected_journalist: # type: ignore
+                    st.caption(f"✅ Displaying newly added data for {selected_journalist}") # type: ignore
+
+        if overview_tab.open:
+            with overview_tab:
+                render_journalist_overview(j_id, j_version, start_ts, end_ts)
 
     # --- RAG/AI CHAT SECTION ---
     if j_id and j_id != "N/A" and selected_journalist:
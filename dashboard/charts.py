@@ -0,0 +1,258 @@
+import datetime
+import io
+
+import pandas as pd
+import streamlit as st # type: ignore
+
+from src.config import COLORS, DASHBOARD_SETTINGS
+from dashboard.mock_utils import generate_mock_analytics
+
+# Charts are built once per article and kept in a bounded LRU (max_entries):
+# Matplotlib charts as finished PNG bytes, Plotly charts as figure dicts.
+# Reruns (row clicks, chat messages) then only send cached bytes/specs.
+# `day` is part of every key because the mock series run up to today,
+# so a server left running past midnight doesn't keep yesterday's charts.
+CACHE_ENTRIES = DASHBOARD_SETTINGS['chart_cache_entries']
+
+# Visual parameters
+FIGSIZE = (2.2, 2.2)   # small square for pies
+BAR_FIG = (1.1, 2.2)   # narrow + same height as pies
+DPI = 160             # increase DPI for crisper text
+FONT_SIZE = 6         # slightly larger for readability
+SAVE_DPI = 200        # what st.pyplot used when rasterizing
+
+RC_PARAMS = {
+    "font.family": "serif",
+    "text.antialiased": True,
+    "font.size": FONT_SIZE,
+}
+
+@st.cache_data(max_entries=CACHE_ENTRIES)
+def article_stats(url, pub_ts=None, day=None):
+    return generate_mock_analytics(url, pub_ts=pub_ts)
+
+def chart_cache_ts(pub_ts):
+    """published_ts as used in the cache keys; pandas NaN would never hit the cache."""
+    return None if pub_ts is None or pd.isna(pub_ts) else int(pub_ts)
+
+def _render_png(draw, figsize):
+    """Runs draw(fig, ax) on a new figure and returns it as PNG bytes; the figure is always closed."""
+    import matplotlib.pyplot as plt
+    with plt.rc_context(RC_PARAMS):
+        fig, ax = plt.subplots(figsize=figsize, dpi=DPI)
+        try:
+            draw(fig, ax)
+            fig.patch.set_alpha(0) # type: ignore
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format="png", dpi=SAVE_DPI, bbox_inches="tight")
+            return buffer.getvalue()
+        finally:
+            plt.close(fig)
+
+def _stroke():
+    # small stroke for better legibility on colored backgrounds
+    import matplotlib.patheffects as pe
+    return [pe.withStroke(linewidth=2, foreground="black", alpha=0.6)]
+
+# --- Matplotlib (PNG) charts ---
+
+@st.cache_data(max_entries=CACHE_ENTRIES)
+def age_chart_png(url, pub_ts=None, day=None):
+    age_df = article_stats(url, pub_ts, day)["age_data"]
+    labels = age_df["Age Group"].tolist()
+
+    def draw(fig, ax):
+        def autopct(pct):
+            label = labels[autopct.idx] # type: ignore
+            autopct.idx += 1 # type: ignore
+            return f"{label}\n{pct:.1f}%"
+        autopct.idx = 0 # type: ignore
+
+        _, _, autotexts = ax.pie(
+            age_df["Readers"],
+            startangle=90,
+            colors=COLORS,
+            autopct=autopct,
+            pctdistance=0.72,
+            wedgeprops=dict(width=0.47, edgecolor="white"),
+            textprops={'fontsize': FONT_SIZE}
+        )
+        for t in autotexts:
+            t.set_color("white")
+            t.set_path_effects(_stroke()) # type: ignore
+            t.set_ha("center") # type: ignore
+            t.set_va("center") # type: ignore
+        ax.axis("equal")
+        fig.tight_layout(pad=0.3)
+
+    return _render_png(draw, FIGSIZE)
+
+@st.cache_data(max_entries=CACHE_ENTRIES)
+def gender_chart_png(url, pub_ts=None, day=None):
+    g_data = article_stats(url, pub_ts, day)["gender_data"]
+
+    def draw(fig, ax):
+        texts, autotexts = ax.pie(
+            g_data['counts'],
+            labels=g_data['labels'],
+            autopct='%1.1f%%',
+            startangle=140,
+            colors=[COLORS[0], COLORS[3]],
+            wedgeprops=dict(width=1, edgecolor='white'),
+            textprops={'fontsize': FONT_SIZE},
+            labeldistance=0.5,
+            pctdistance=0.72
+        )[1:]
+        for t in list(texts) + list(autotexts):
+            t.set_color("white")
+            t.set_path_effects(_stroke()) # type: ignore
+        ax.axis('equal')
+        fig.tight_layout(pad=0.3)
+
+    return _render_png(draw, FIGSIZE)
+
+@st.cache_data(max_entries=CACHE_ENTRIES)
+def device_chart_png(url, pub_ts=None, day=None):
+    dev_data = article_stats(url, pub_ts, day)['device_data']
+    mobile, desktop, other = dev_data['Mobile'], dev_data['Desktop'], dev_data['Other']
+
+    def draw(fig, ax):
+        ax.set_ylim(0, 100)
+        ax.set_xlim(-0.5, 1.5)
+        ax.axis('off')
+
+        # Draw stacked bars bottom -> top: other, desktop, mobile
+        ax.bar(0, other, width=0.5, color=COLORS[1], edgecolor='white')
+        ax.bar(0, desktop, width=0.5, bottom=other, color=COLORS[2], edgecolor='white')
+        ax.bar(0, mobile, width=0.5, bottom=other + desktop, color=COLORS[3], edgecolor='white')
+
+        label_kwargs = dict(va='center', ha='left', fontsize=FONT_SIZE, color='white',
+                            bbox=dict(facecolor='black', alpha=0.35, boxstyle='round,pad=0.2', edgecolor='none'))
+        labels = [
+            ax.text(0.62, other / 2, f"Other\n{other:.0f}%", **label_kwargs), # type: ignore
+            ax.text(0.62, other + desktop / 2, f"Desktop\n{desktop:.0f}%", **label_kwargs), # type: ignore
+            ax.text(0.62, other + desktop + mobile / 2, f"Mobile\n{mobile:.0f}%", **label_kwargs), # type: ignore
+        ]
+        for txt in labels:
+            txt.set_path_effects(_stroke()) # type: ignore
+        fig.tight_layout(pad=0.3)
+
+    return _render_png(draw, BAR_FIG)
+
+# --- Plotly charts (rendered in the browser, no rasterization) ---
+
+PLOTLY_PIE_LAYOUT = dict(
+    paper_bgcolor='rgba(0,0,0,0)',
+    margin=dict(l=0, r=0, t=0, b=0),
+    height=260,
+    showlegend=False,
+)
+
+@st.cache_data(max_entries=CACHE_ENTRIES)
+def age_chart_plotly(url, pub_ts=None, day=None):
+    import plotly.graph_objects as go # type: ignore
+    age_df = article_stats(url, pub_ts, day)["age_data"]
+    fig = go.Figure(go.Pie(
+        labels=age_df["Age Group"], values=age_df["Readers"], hole=0.47, sort=False,
+        marker=dict(colors=COLORS, line=dict(color="white", width=1)),
+        textinfo="label+percent", direction="clockwise", rotation=90
+    ))
+    fig.update_layout(**PLOTLY_PIE_LAYOUT)
+    return fig.to_dict()
+
+@st.cache_data(max_entries=CACHE_ENTRIES)
+def gender_chart_plotly(url, pub_ts=None, day=None):
+    import plotly.graph_objects as go # type: ignore
+    g_data = article_stats(url, pub_ts, day)["gender_data"]
+    fig = go.Figure(go.Pie(
+        labels=g_data['labels'], values=g_data['counts'], sort=False,
+        marker=dict(colors=[COLORS[0], COLORS[3]], line=dict(color="white", width=1)),
+        textinfo="label+percent", rotation=140
+    ))
+    fig.update_layout(**PLOTLY_PIE_LAYOUT)
+    return fig.to_dict()
+
+@st.cache_data(max_entries=CACHE_ENTRIES)
+def device_chart_plotly(url, pub_ts=None, day=None):
+    import plotly.graph_objects as go # type: ignore
+    dev_data = article_stats(url, pub_ts, day)['device_data']
+    fig = go.Figure()
+    for name, color in (("Other", COLORS[1]), ("Desktop", COLORS[2]), ("Mobile", COLORS[3])):
+        fig.add_trace(go.Bar(
+            x=[""], y=[dev_data[name]], name=name, marker_color=color,
+            text=f"{name}<br>{dev_data[name]:.0f}%", textposition="inside"
+        ))
+    fig.update_layout(
+        barmode="stack", paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=0, r=0, t=0, b=0), height=260, showlegend=False,
+        yaxis=dict(visible=False, range=[0, 100]), xaxis=dict(visible=False)
+    )
+    return fig.to_dict()
+
+@st.cache_data(max_entries=CACHE_ENTRIES)
+def traffic_chart(url, pub_ts=None, day=None):
+    import plotly.graph_objects as go # type: ignore
+    ts_df = article_stats(url, pub_ts, day)['clicks_df']
+
+    fig = go.Figure()
+    # Add the Area Trace (The "Mountain")
+    fig.add_trace(go.Scatter(
+        x=ts_df['Date'],
+        y=ts_df['Views'],
+        mode='lines',
+        fill='tozeroy', # Fills area below the line
+        line=dict(color=COLORS[2], width=2), # Your theme green
+        name='Views'
+    ))
+    # Update Layout for "Bloomberg" Aesthetic
+    fig.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)', # Transparent background
+        plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=0, r=0, t=0, b=0), # Remove whitespace
+        height=350,
+        hovermode="x unified", # Tooltip shows data for all lines at that x-position
+        xaxis=dict(
+            showgrid=False,
+            showline=True,
+            linecolor='#333',
+            rangeselector=dict(activecolor=COLORS[2]),
+            rangeslider=dict(visible=True, thickness=0.1), # The Zoom Bar at bottom!
+            type="date"
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor='#333', # Subtle grid lines
+            zeroline=False
+        )
+    )
+    return fig.to_dict()
+
+def render_article_charts(url, pub_ts=None, plotly_only=False):
+    """Renders the audience charts and traffic history of one article."""
+    pub_ts = chart_cache_ts(pub_ts)
+    day = datetime.date.today()
+
+    c1, c2, c3 = st.columns([2, 2, 1])
+    with c1:
+        st.write("**Reader Age Distribution**")
+        if plotly_only:
+            st.plotly_chart(age_chart_plotly(url, pub_ts, day), use_container_width=True)
+        else:
+            st.image(age_chart_png(url, pub_ts, day), width='content')
+    with c2:
+        st.write("**Gender Distribution**")
+        if plotly_only:
+            st.plotly_chart(gender_chart_plotly(url, pub_ts, day), use_container_width=True)
+        else:
+            st.image(gender_chart_png(url, pub_ts, day), width='content')
+    with c3:
+        st.write("**Device Split**")
+        if plotly_only:
+            st.plotly_chart(device_chart_plotly(url, pub_ts, day), use_container_width=True)
+        else:
+            st.image(device_chart_png(url, pub_ts, day), width='content')
+
+    # --- Interactive time series chart ---
+    st.markdown("---")
+    st.subheader("📈 Traffic History")
+    st.plotly_chart(traffic_chart(url, pub_ts, day), use_container_width=True)
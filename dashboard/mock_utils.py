@@ -1,101 +1,140 @@
-import random
+import hashlib
 import datetime
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go # type: ignore
 
-def generate_mock_analytics(seed_str, pub_date_str=None):
+def _url_rng(seed_str):
     """
-    Generates consistent 'fake' stats based on the input seed (url)
-    and publish date.
+    Random generator of one article. Seeded from a hash of the URL so the
+    stats are the same in every process, and local so concurrent sessions
+    don't reseed each other's global random state.
     """
-    # Seed the random generator so the stats for a specific article are always the same
-    random.seed(seed_str)
-    
-    np.random.seed(sum(ord(c) for c in seed_str) % (2**32))
-    
-    # --- Date Handling ---
+    digest = hashlib.sha256(seed_str.encode('utf-8')).digest()
+    return np.random.default_rng(int.from_bytes(digest[:8], 'little'))
+
+def _publish_date(pub_date_str=None, pub_ts=None, today=None):
+    today = today or datetime.date.today()
     try:
-        pub_date = pd.to_datetime(pub_date_str).date() # type: ignore
+        if pub_ts is not None and not pd.isna(pub_ts):
+            pub_date = datetime.datetime.fromtimestamp(pub_ts, datetime.timezone.utc).date()
+        else:
+            pub_date = pd.to_datetime(pub_date_str).date() # type: ignore
+        if pd.isna(pub_date):
+            raise ValueError("no publish date")
     except:
-        pub_date = datetime.date.today() - datetime.timedelta(days=30)
-    
-    today = datetime.date.today()
+        pub_date = today - datetime.timedelta(days=30)
+
     if pub_date > today:
         pub_date = today - datetime.timedelta(days=1)
-        
-    days_diff = (today - pub_date).days
-    date_range = [pub_date + datetime.timedelta(days=i) for i in range(days_diff + 1)]
-    
-    # --- Article clicks/traffic generation ---
-    
+    return pub_date
+
+def _daily_views(rng, n_days):
+    """Views per day since publishing (index 0 = publish day), as an int array."""
+    days = np.arange(n_days)
+
     # Base "Background" Noise
-    daily_clicks = np.random.randint(10, 100, size=len(date_range)).astype(float)
-    
-    # the usual initial viral spike
-    initial_spike_height = random.randint(1337, 67000)
-    decay_rate = random.uniform(0.45, 0.75) # Randomized decay "stickiness"
-    
-    for i in range(len(date_range)):
-        # Calculate exponential decay + add a bit of daily noise to the spike
-        spike_val = initial_spike_height * (decay_rate ** i)
-        noise = random.uniform(0.8, 1.2) # some jitter :D
-        daily_clicks[i] += (spike_val * noise)
-    
+    daily_clicks = rng.integers(10, 100, size=n_days).astype(float)
+
+    # the usual initial viral spike, decaying exponentially with some daily jitter
+    initial_spike_height = rng.integers(1337, 67000, endpoint=True)
+    decay_rate = rng.uniform(0.45, 0.75) # Randomized decay "stickiness"
+    daily_clicks += initial_spike_height * decay_rate ** days * rng.uniform(0.8, 1.2, size=n_days)
+
     # mini-Resurgences
-    num_bumps = 0
-    if days_diff > 14:
-        num_bumps = random.randint(1, max(2, days_diff // 60))
-        
-    for _ in range(num_bumps):
-        # Pick a day after the initial spike has settled
-        if len(date_range) > 10:
-            bump_day = random.randint(7, len(date_range)-1)
-            # Make the bump significant: 10-30% of the original spike
-            bump_height = initial_spike_height * random.uniform(0.1, 0.3)
-            # Apply a smaller mini-decay for the bump itself (3-day effect)
-            for j in range(3):
-                if bump_day + j < len(date_range):
-                    daily_clicks[bump_day + j] += bump_height * (0.5 ** j)
-
-    daily_clicks = [max(0, int(c * random.uniform(0.95, 1.05))) for c in daily_clicks]
+    days_diff = n_days - 1
+    num_bumps = rng.integers(1, max(2, days_diff // 60), endpoint=True) if days_diff > 14 else 0
+    if num_bumps and n_days > 10:
+        # Pick days after the initial spike has settled
+        bump_days = rng.integers(7, n_days - 1, size=num_bumps, endpoint=True)
+        # Make the bumps significant: 10-30% of the original spike
+        bump_heights = initial_spike_height * rng.uniform(0.1, 0.3, size=num_bumps)
+        # Each bump halves over three days
+        offsets = np.arange(3)
+        bump_index = bump_days[:, None] + offsets
+        bump_values = bump_heights[:, None] * 0.5 ** offsets
+        inside = bump_index < n_days
+        np.add.at(daily_clicks, bump_index[inside], bump_values[inside])
+
+    daily_clicks *= rng.uniform(0.95, 1.05, size=n_days)
+    return np.maximum(daily_clicks, 0).astype(np.int64)
+
+def generate_mock_analytics(seed_str, pub_date_str=None, pub_ts=None):
+    """
+    Generates consistent 'fake' stats based on the input seed (url)
+    and publish date (an ISO string, or pub_ts as UTC epoch seconds).
+    """
+    rng = _url_rng(seed_str)
 
+    # --- Date Handling ---
+    today = datetime.date.today()
+    pub_date = _publish_date(pub_date_str, pub_ts, today)
+    n_days = (today - pub_date).days + 1
+    date_range = pd.date_range(pub_date, periods=n_days, freq='D').date
+
+    # --- Article clicks/traffic generation ---
+    # drawn first, so generate_mock_views gives the same series
+    daily_clicks = _daily_views(rng, n_days)
     clicks_df = pd.DataFrame({"Date": date_range, "Views": daily_clicks})
-    
+
     # read time
-    avg_read_time = random.uniform(0.4, 8.0) # Minutes
-    conversion_rate = random.uniform(0.5, 6.9) # Percent
-    
+    avg_read_time = float(rng.uniform(0.4, 8.0)) # Minutes
+    conversion_rate = float(rng.uniform(0.5, 6.9)) # Percent
+
     # --- Mock Age Distribution ---
     age_groups = ['16-24', '25-34', '35-44', '45-54', '55-64', '65+']
-    age_data = [random.randint(10, 100) for _ in age_groups]
-    
+    age_data = rng.integers(10, 100, size=len(age_groups), endpoint=True)
+
     # ---- Mock Gender distribution ---
-    male = random.randint(35, 60)
-    female = random.randint(40, 65)
+    male = rng.integers(35, 60, endpoint=True)
+    female = rng.integers(40, 65, endpoint=True)
     total = male + female
-    gender_counts = [male / total * 100, female / total * 100]
+    gender_counts = [float(male / total * 100), float(female / total * 100)]
     gender_labels = ["Male", "Female"]
-    
+
     # --- Mock device split ---
-    r1 = random.randint(65, 80)
-    r2 = random.randint(20, 30)
+    r1 = rng.integers(65, 80, endpoint=True)
+    r2 = rng.integers(20, 30, endpoint=True)
     r3 = max(2, 100 - (r1 + r2)) # Other (Tablet/Console)
-    
+
     # Normalize exactly to 100% just in case
     total = r1 + r2 + r3
     device_data = {
-        "Mobile": (r1 / total) * 100,
-        "Desktop": (r2 / total) * 100,
-        "Other": (r3 / total) * 100
+        "Mobile": float(r1 / total * 100),
+        "Desktop": float(r2 / total * 100),
+        "Other": float(r3 / total * 100)
     }
-    
+
     return {
-        "views": sum(daily_clicks),
+        "views": int(daily_clicks.sum()),
         "clicks_df": clicks_df,
         "read_time": avg_read_time,
         "conversions": conversion_rate,
         "age_data": pd.DataFrame({"Age Group": age_groups, "Readers": age_data}),
         "gender_data": {"labels": gender_labels, "counts": gender_counts},
         "device_data": device_data
-    }
\ No newline at end of file
+    }
+
+def generate_mock_views(urls, pub_dates=None, pub_ts=None):
+    """
+    Daily views of many articles at once, on a shared date axis.
+
+    pub_dates (ISO strings) or pub_ts (UTC epoch seconds) are given per
+    URL, like in generate_mock_analytics. Returns (dates, views): dates
+    from the earliest publish date to today, and an int matrix with one
+    row per URL that is zero before the article was published. Each row
+    equals the article's clicks_df['Views'] from generate_mock_analytics.
+    """
+    n = len(urls)
+    pub_dates = [None] * n if pub_dates is None else list(pub_dates)
+    pub_ts = [None] * n if pub_ts is None else list(pub_ts)
+
+    today = datetime.date.today()
+    published = [_publish_date(d, ts, today) for d, ts in zip(pub_dates, pub_ts)]
+    first = min(published, default=today)
+    dates = pd.date_range(first, today, freq='D').date
+
+    views = np.zeros((n, len(dates)), dtype=np.int64)
+    for row, (url, pub_date) in enumerate(zip(urls, published)):
+        start = (pub_date - first).days
+        views[row, start:] = _daily_views(_url_rng(url), len(dates) - start)
+    return dates, views
@@ -1,10 +1,13 @@
 import streamlit as st # type: ignore
-from src.rag_logic import RAGChain, RAGIngestion
 import time
 
+# src.rag_logic pulls in LangChain, Chroma and sentence-transformers (torch),
+# so it is imported on first use, not when the dashboard starts.
+
 # load embedding model once per session, not on every interaction.
 @st.cache_resource
 def get_rag_chain():
+    from src.rag_logic import RAGChain
     return RAGChain()
 
 def render_rag_ui(journalist_id, journalist_name):
@@ -20,6 +23,7 @@ def render_rag_ui(journalist_id, journalist_name):
     with col2:
         if st.button("🔄 Sync/Update AI"):
             with st.spinner(f"Vectorizing {journalist_name}'s articles..."):
+                from src.rag_logic import RAGIngestion
                 ingester = RAGIngestion()
                 success = ingester.ingest_journalist_data(journalist_id)
                 if success:
@@ -0,0 +1,105 @@
+import datetime
+
+import pandas as pd
+import streamlit as st # type: ignore
+
+from src.config import COLORS, DASHBOARD_SETTINGS, DISPLAY_TZ
+from src.database import get_articles_published_between
+from dashboard.mock_utils import generate_mock_views
+
+# Journalist-level traffic: every article's daily views on one shared date
+# axis (generate_mock_views), reduced to a total per day and a total per
+# article. Only the reductions are cached; the full articles x days matrix
+# is dropped right after, it can be tens of MB for a prolific journalist.
+
+def journalist_rollup(articles):
+    """
+    Rolls up the mock traffic of a list of article dicts (id, title, url,
+    published_ts, char_count). Returns (daily, per_article): total views
+    per day as a DataFrame indexed by date, and the articles with their
+    lifetime views, most viewed first.
+    Articles without a publish date (details not fetched yet) are left
+    out: the mock series would start them all on the same made-up day.
+    """
+    per_article = pd.DataFrame(articles, columns=['id', 'title', 'url', 'published_ts', 'char_count'])
+    per_article = per_article[per_article['published_ts'].notna()].reset_index(drop=True)
+    dates, views = generate_mock_views(per_article['url'].tolist(), pub_ts=per_article['published_ts'].tolist())
+
+    daily = pd.DataFrame({"Views": views.sum(axis=0)}, index=pd.DatetimeIndex(dates, name="Date"))
+    per_article['views'] = views.sum(axis=1)
+    per_article['published'] = pd.to_datetime(per_article['published_ts'], unit='s', utc=True).dt.tz_convert(DISPLAY_TZ)
+    per_article = per_article.sort_values('views', ascending=False, ignore_index=True)
+    return daily, per_article
+
+# `day` is part of the key because the mock series run up to today
+@st.cache_data(max_entries=20, show_spinner="Adding up traffic over all articles...")
+def load_rollup(journalist_id, version, day, start_ts=None, end_ts=None):
+    return journalist_rollup(get_articles_published_between(journalist_id, start_ts, end_ts))
+
+def _daily_chart(daily):
+    import plotly.graph_objects as go # type: ignore
+    fig = go.Figure(go.Scatter(
+        x=daily.index, y=daily['Views'], mode='lines', fill='tozeroy',
+        line=dict(color=COLORS[2], width=2), name='Views'
+    ))
+    fig.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=0, r=0, t=0, b=0), height=350, hovermode="x unified",
+        xaxis=dict(showgrid=False, showline=True, linecolor='#333',
+                   rangeslider=dict(visible=True, thickness=0.1), type="date"),
+        yaxis=dict(showgrid=True, gridcolor='#333', zeroline=False)
+    )
+    return fig
+
+def _length_chart(per_article):
+    import plotly.graph_objects as go # type: ignore
+    # WebGL scatter stays smooth with thousands of points
+    fig = go.Figure(go.Scattergl(
+        x=per_article['char_count'], y=per_article['views'], mode='markers',
+        marker=dict(color=COLORS[3], size=6, opacity=0.6),
+        text=per_article['title'], hovertemplate="%{text}<br>%{x:,} chars, %{y:,} views<extra></extra>"
+    ))
+    fig.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=0, r=0, t=0, b=0), height=350,
+        xaxis=dict(title="Length (chars)", showgrid=False, showline=True, linecolor='#333'),
+        yaxis=dict(title="Views", showgrid=True, gridcolor='#333', zeroline=False)
+    )
+    return fig
+
+def render_journalist_overview(journalist_id, version, start_ts=None, end_ts=None):
+    """Traffic over all of a journalist's articles: daily total, top articles and views vs length."""
+    daily, per_article = load_rollup(journalist_id, version, datetime.date.today(), start_ts, end_ts)
+    if per_article.empty:
+        st.info("No articles in the selected date range.")
+        return
+
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Total Views", f"{int(per_article['views'].sum()):,}")
+    m2.metric("Median Views per Article", f"{int(per_article['views'].median()):,}")
+    m3.metric("Best Day", f"{int(daily['Views'].max()):,}", delta=daily['Views'].idxmax().strftime("%d.%m.%Y"), delta_color="off")
+
+    st.subheader("📈 Daily Views, All Articles")
+    st.plotly_chart(_daily_chart(daily), use_container_width=True)
+
+    top_n = DASHBOARD_SETTINGS['top_articles']
+    st.subheader(f"🏆 Top {top_n} Articles")
+    st.dataframe(
+        per_article.head(top_n)[['title', 'url', 'published', 'char_count', 'views']],
+        column_config={
+            "title": st.column_config.TextColumn("Title", width="large"),
+            "url": st.column_config.LinkColumn("Link", width=20),
+            "published": st.column_config.DateColumn("Published", format="DD.MM.YYYY", width=20),
+            "char_count": st.column_config.NumberColumn("Length", format="%d", width=20),
+            "views": st.column_config.NumberColumn("Views", format="%d", width=20),
+        },
+        use_container_width=True,
+        hide_index=True
+    )
+
+    st.subheader("📏 Views vs Article Length")
+    with_length = per_article[per_article['char_count'].notna()]
+    if with_length.empty:
+        st.caption("No article lengths yet, fetch the article details first.")
+    else:
+        st.plotly_chart(_length_chart(with_length), use_container_width=True)
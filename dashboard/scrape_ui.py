@@ -0,0 +1,89 @@
+import streamlit as st # type: ignore
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config import SCRAPER_SETTINGS
+from src.database import ensure_db, create_scrape_job, get_recent_scrape_jobs
+
+# The scraper modules (Selenium, webdriver-manager, bs4) are imported when
+# the first scrape is submitted, not when the dashboard starts.
+
+# one pool per server process, shared by all sessions: scrapes keep
+# running when the browser tab is refreshed or closed
+@st.cache_resource
+def get_scrape_executor():
+    from src.fetcher import HostRateLimiter, set_default_rate_limiter
+    # concurrent scrapes share one per-host budget instead of one each
+    set_default_rate_limiter(HostRateLimiter())
+    return ThreadPoolExecutor(
+        max_workers=SCRAPER_SETTINGS['dashboard_scrape_workers'],
+        thread_name_prefix="dashboard-scrape"
+    )
+
+def submit_scrape(profile_id, max_articles, incremental=False):
+    """
+    Queues a headless scrape in the background and returns its job ID.
+    Progress is recorded in scrape_jobs (see render_scrape_progress).
+    """
+    from main import run_scraper_pipeline
+    ensure_db()
+    job_id = create_scrape_job(profile_id, max_articles, incremental, status='queued')
+    get_scrape_executor().submit(
+        run_scraper_pipeline, profile_id,
+        max_articles=max_articles, incremental=incremental, job_id=job_id, headless=True
+    )
+    st.session_state.setdefault('scrape_jobs', set()).add(job_id)
+    return job_id
+
+def _job_progress(job):
+    """Fraction done and a one-line summary of a scrape job."""
+    done = job['details_completed'] + job['details_failed']
+    # until the feed is exhausted the only known total is the article limit
+    if job['feed_done'] or not job['max_articles']:
+        total = job['articles_discovered']
+    else:
+        total = max(job['max_articles'], job['articles_discovered'])
+    fraction = min(1.0, done / total) if total else 0.0
+    summary = f"{job['details_completed']}/{total or '?'} fetched"
+    if job['details_failed']:
+        summary += f", {job['details_failed']} failed"
+    if not job['feed_done'] and job['status'] == 'running':
+        summary += f" · feed page {job['feed_depth'] + 1}"
+    return fraction, summary
+
+@st.fragment(run_every=SCRAPER_SETTINGS['progress_poll_seconds'])
+def render_scrape_progress():
+    """
+    Sidebar list of recent scrape jobs. Re-runs on its own every few
+    seconds without re-running the rest of the page.
+    """
+    jobs = get_recent_scrape_jobs()
+    if not jobs:
+        return
+    st.subheader("Scrape jobs")
+
+    my_jobs = st.session_state.get('scrape_jobs', set())
+    finished = st.session_state.setdefault('finished_scrape_jobs', set())
+    newly_finished = []
+
+    for job in jobs:
+        name = job['journalist_name'] or job['journalist_id']
+        fraction, summary = _job_progress(job)
+        if job['status'] == 'completed':
+            st.success(f"{name}: done, {summary}")
+        elif job['status'] == 'failed':
+            st.error(f"{name}: failed ({job['last_error']})")
+        elif job['status'] == 'queued':
+            st.info(f"{name}: waiting for a free worker")
+        else:
+            st.progress(fraction, text=f"{name}: {summary}")
+
+        if job['id'] in my_jobs and job['status'] in ('completed', 'failed') and job['id'] not in finished:
+            finished.add(job['id'])
+            newly_finished.append(job)
+
+    if newly_finished:
+        completed = [job for job in newly_finished if job['status'] == 'completed']
+        if completed:
+            st.session_state['last_added_journalist'] = completed[-1]['journalist_name']
+        # the whole page reloads; only the scraped journalist's caches miss
+        st.rerun()
@@ -1,17 +1,54 @@
-import time
+import argparse
 import re
-from src.database import init_db, upgrade_db_schema, save_articles, get_articles_missing_metadata, update_article_full_data, create_journalist
-from src.scraper import scrape_profile_feed_generator, fetch_yle_article_details, scrape_journalist_name
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from src.database import (
+    ensure_db, save_articles, get_due_articles, record_fetch_failures,
+    get_article_urls, get_known_article_ids, update_articles_full_data, create_journalist,
+    create_scrape_job, update_scrape_job, add_scrape_job_articles, increment_scrape_job_details,
+    get_scrape_job, get_latest_unfinished_job, backfill_article_keywords, convert_article_content
+)
+from src.scraper import scrape_profile_feed_generator, scrape_journalist_name, fetch_yle_article_details
+from src.fetcher import fetch_articles_concurrently, pipeline_feed, SharedHostRateLimiter, set_default_rate_limiter
+from src.http_client import get_http_client
+from src.config import SCRAPER_SETTINGS
 
-def run_scraper_pipeline(target_profile_id, max_articles=10):
+def run_scraper_pipeline(target_profile_id, max_articles=10, fetch_workers=None, incremental=False, pipelined=True, job_id=None, headless=False):
     """
     Runs the full scraping pipeline for a specific journalist ID.
+    Article details are fetched concurrently (see SCRAPER_SETTINGS for the
+    worker count and per-host rate limit).
+    With incremental=True the feed scrape stops once it reaches articles
+    that are already in the database.
+    With pipelined=True detail fetching starts as soon as the first feed
+    batch is saved, instead of after the whole feed has been scraped.
+    Every run is recorded as a scrape job with checkpoints; pass job_id to
+    continue an earlier job (see resume_scrape_job).
+    headless=True runs Chrome without a window.
     Returns the name of the journalist scraped.
     """
     
     # Database Setup
-    init_db()
-    upgrade_db_schema()
+    ensure_db()
+    
+    job = get_scrape_job(job_id) if job_id else None
+    if job is None:
+        job_id = create_scrape_job(target_profile_id, max_articles, incremental)
+        job = get_scrape_job(job_id)
+    else:
+        update_scrape_job(job_id, status='running', last_error=None)
+    
+    try:
+        result = _run_scrape_job(job, max_articles, fetch_workers, incremental, pipelined, headless)
+    except BaseException as e:
+        update_scrape_job(job_id, status='failed', last_error=str(e) or type(e).__name__)
+        raise
+    update_scrape_job(job_id, status='completed')
+    return result
+
+def _run_scrape_job(job, max_articles, fetch_workers, incremental, pipelined, headless):
+    job_id = job['id']
+    target_profile_id = job['journalist_id']
     
     # Identify Journalist
     print(f"Resolving journalist name for ID: {target_profile_id}...")
@@ -21,39 +58,286 @@ def run_scraper_pipeline(target_profile_id, max_articles=10):
     create_journalist(target_profile_id, journalist_name)
     
     # Fetch Links
-    print(f"--- Fetching max {max_articles} links ---")
-    for article_batch in scrape_profile_feed_generator(target_profile_id, max_articles=max_articles):
-        save_articles(target_profile_id, article_batch)
+    known_ids = None
+    if incremental:
+        known_ids = get_known_article_ids(target_profile_id)
+        print(f"Incremental mode: {len(known_ids)} articles already known.")
     
-    # Fetch Content & Metadata
-    print("\n--- Updating Article Details ---")
+    def save_checkpoint(depth, card_offset):
+        update_scrape_job(job_id, feed_depth=depth, feed_card_offset=card_offset)
     
-    # Only get articles that are missing data 
-    pending_articles = get_articles_missing_metadata()
+    if job['feed_done']:
+        print("--- Feed already scraped for this job, skipping ---")
+        feed = (batch for batch in ())
+    else:
+        print(f"--- Fetching max {max_articles} links ---")
+        feed = scrape_profile_feed_generator(
+            target_profile_id,
+            max_articles=max_articles,
+            known_ids=known_ids,
+            stop_after_known=SCRAPER_SETTINGS['incremental_stop_after'],
+            checkpoint={
+                "depth": job['feed_depth'],
+                "card_offset": job['feed_card_offset'],
+                "article_ids": job['article_ids'],
+            },
+            on_checkpoint=save_checkpoint,
+            headless=headless
+        )
     
-    # Filter pending articles to only match the current journalist 
-    pending_for_this_journalist = [a for a in pending_articles if target_profile_id in a['url']]
+    def save_batch(article_batch):
+        new_articles = save_articles(target_profile_id, article_batch)
+        add_scrape_job_articles(job_id, [a['id'] for a in article_batch])
+        return new_articles
     
     count_updated = 0
-    for i, article in enumerate(pending_articles):
-        url = article['url']
-        print(f"[{i+1}/{len(pending_articles)}] Processing: {url}")
+    total = None
+    write_batch_size = SCRAPER_SETTINGS['write_batch_size']
+    finished_rows = []
+    failures = []
+
+    def flush_results():
+        # one transaction per group of results instead of one per article
+        nonlocal count_updated
+        if finished_rows:
+            count_updated += update_articles_full_data(finished_rows)
+        if failures:
+            record_fetch_failures(failures)
+        if finished_rows or failures:
+            increment_scrape_job_details(job_id, completed=len(finished_rows), failed=len(failures))
+        finished_rows.clear()
+        failures.clear()
+
+    def handle_result(article, data, error, done_count):
+        progress = f"{done_count}/{total}" if total is not None else f"{done_count}"
+        print(f"[{progress}] Processed: {article['url']}")
+
+        if error:
+            failures.append((article['id'], error))
+        elif data:
+            finished_rows.append({"id": article['id'], **data})
+
+        if len(finished_rows) + len(failures) >= write_batch_size:
+            flush_results()
+
+    if pipelined:
+        # Fetch Links and Content & Metadata at the same time
+        print("\n--- Updating Article Details (pipelined) ---")
+        queued_ids = set()
+
+        def pending_articles():
+            for article in pipeline_feed(feed, save_batch):
+                queued_ids.add(article['id'])
+                yield article
+            update_scrape_job(job_id, feed_done=1)
+            # earlier failures of this journalist that are due for a retry,
+            # and anything a crashed run saved but never fetched
+            for article in get_due_articles(target_profile_id):
+                if article['id'] not in queued_ids:
+                    yield article
+
+        try:
+            fetch_articles_concurrently(pending_articles(), handle_result, workers=fetch_workers)
+        finally:
+            flush_results()
+    else:
+        for article_batch in feed:
+            save_batch(article_batch)
+        update_scrape_job(job_id, feed_done=1)
         
-        data = fetch_yle_article_details(url)
+        # Fetch Content & Metadata
+        print("\n--- Updating Article Details ---")
         
-        if data:
-            update_article_full_data(
-                article['id'], 
-                data['content'], 
-                data['description'], 
-                data['keywords'],
-                data['published_date']
-            )
-            count_updated += 1
+        # Only get this journalist's articles whose fetch is due
+        pending_articles = get_due_articles(target_profile_id)
         
-        time.sleep(0.5) 
+        total = len(pending_articles)
+        try:
+            fetch_articles_concurrently(pending_articles, handle_result, workers=fetch_workers)
+        finally:
+            flush_results()
+
+    http_stats = get_http_client().get_stats()
+    print(f"HTTP: {http_stats['requests']} requests, {http_stats['errors']} errors, "
+          f"avg {http_stats['avg_time']:.2f}s, max {http_stats['max_time']:.2f}s")
 
     return journalist_name, count_updated
 
+def resume_scrape_job(job_id=None, journalist_id=None, fetch_workers=None, headless=False):
+    """
+    Continues an interrupted scrape from its last checkpoint: the feed is
+    replayed to the recorded page depth without re-reading cards, and only
+    articles whose details are still missing are fetched.
+    Defaults to the newest unfinished job (optionally of one journalist).
+    """
+    ensure_db()
+    
+    job = get_scrape_job(job_id) if job_id else get_latest_unfinished_job(journalist_id)
+    if job is None:
+        print("No unfinished scrape job to resume.")
+        return None
+    
+    print(f"Resuming job {job['id']} for {job['journalist_id']}: "
+          f"{job['articles_discovered']} articles discovered, {job['details_completed']} details completed.")
+    max_articles = job['max_articles'] if job['max_articles'] is not None else float('inf')
+    return run_scraper_pipeline(
+        job['journalist_id'],
+        max_articles=max_articles,
+        fetch_workers=fetch_workers,
+        incremental=bool(job['incremental']),
+        job_id=job['id'],
+        headless=headless
+    )
+
+def reparse_cached_articles(journalist_id=None):
+    """
+    Re-runs the article extraction over the on-disk HTML cache without
+    touching the network. Useful after changing the parsing rules.
+    Returns the number of articles updated.
+    """
+    ensure_db()
+
+    articles = get_article_urls(journalist_id)
+    rows = []
+    for article in articles:
+        data = fetch_yle_article_details(article['url'], offline=True)
+        if data:
+            rows.append({"id": article['id'], **data})
+    count_updated = update_articles_full_data(rows)
+
+    print(f"Reparsed {count_updated}/{len(articles)} articles from cache.")
+    return count_updated
+
+def _init_batch_worker(rate_limiter):
+    set_default_rate_limiter(rate_limiter)
+
+def _scrape_one(profile_id, max_articles, incremental, fetch_workers):
+    """Runs one journalist in a worker process. Never raises, so one failure doesn't stop the batch."""
+    start = time.perf_counter()
+    try:
+        name, count = run_scraper_pipeline(
+            profile_id,
+            max_articles=max_articles,
+            fetch_workers=fetch_workers,
+            incremental=incremental,
+            headless=True
+        )
+        error = None
+    except Exception as e:
+        name, count, error = None, 0, str(e)
+    return {
+        "profile_id": profile_id,
+        "name": name,
+        "articles": count,
+        "seconds": time.perf_counter() - start,
+        "error": error,
+    }
+
+def run_batch_scrape(profile_ids, processes=2, max_articles=10, incremental=False, fetch_workers=None):
+    """
+    Scrapes several journalists in parallel, one worker process (and one
+    headless Chrome) per journalist at a time. All processes share one
+    request budget for the hosts in SCRAPER_SETTINGS['shared_rate_hosts'].
+    Returns one result dict per journalist.
+    """
+    # create the schema once instead of racing on it from every worker
+    ensure_db()
+    
+    rate_limiter = SharedHostRateLimiter()
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_batch_worker,
+        initargs=(rate_limiter,)
+    ) as executor:
+        futures = [
+            executor.submit(_scrape_one, profile_id, max_articles, incremental, fetch_workers)
+            for profile_id in profile_ids
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            status = "failed: " + result['error'] if result['error'] else f"{result['articles']} articles"
+            print(f"Finished {result['profile_id']} ({status})")
+            results.append(result)
+    return results
+
+def print_batch_summary(results):
+    print(f"\n{'Profile ID':<14} {'Journalist':<28} {'Articles':>8} {'Seconds':>8} {'Art/s':>6}")
+    for r in sorted(results, key=lambda r: r['profile_id']):
+        rate = r['articles'] / r['seconds'] if r['seconds'] else 0.0
+        name = r['name'] or f"ERROR: {r['error']}"
+        print(f"{r['profile_id']:<14} {name[:28]:<28} {r['articles']:>8} {r['seconds']:>8.1f} {rate:>6.2f}")
+    total_articles = sum(r['articles'] for r in results)
+    total_seconds = max((r['seconds'] for r in results), default=0.0)
+    print(f"{'TOTAL':<14} {'':<28} {total_articles:>8} {total_seconds:>8.1f} "
+          f"{(total_articles / total_seconds if total_seconds else 0.0):>6.2f}")
+
+def read_profile_ids(ids, file_path=None):
+    """Collects profile IDs (or profile URLs) from the command line and an optional file, one per line."""
+    raw = list(ids)
+    if file_path:
+        with open(file_path, encoding='utf-8') as f:
+            raw.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+    profile_ids = []
+    for item in raw:
+        match = re.search(r'56-\d+-\d+', item)
+        if match and match.group(0) not in profile_ids:
+            profile_ids.append(match.group(0))
+    return profile_ids
+
+def main():
+    parser = argparse.ArgumentParser(description="Yle journalist scraper")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scrape = commands.add_parser("scrape", help="scrape one or more journalists")
+    scrape.add_argument("profile_ids", nargs="*", help="profile IDs or URLs, e.g. 56-74-1533")
+    scrape.add_argument("--file", help="file with one profile ID or URL per line")
+    scrape.add_argument("--processes", type=int, default=2, help="journalists scraped in parallel")
+    scrape.add_argument("--max-articles", type=int, default=10)
+    scrape.add_argument("--all", action="store_true", help="no article limit")
+    scrape.add_argument("--incremental", action="store_true", help="stop at already saved articles")
+    scrape.add_argument("--fetch-workers", type=int, help="detail fetch threads per process")
+
+    resume = commands.add_parser("resume", help="continue an interrupted scrape job")
+    resume.add_argument("--job-id", type=int)
+    resume.add_argument("--journalist", help="resume the newest unfinished job of this profile ID")
+
+    reparse = commands.add_parser("reparse", help="re-extract articles from the HTML cache (no network)")
+    reparse.add_argument("--journalist", help="only this profile ID")
+
+    keywords = commands.add_parser("backfill-keywords", help="rebuild the keyword table from saved articles")
+    keywords.add_argument("--journalist", help="only this profile ID")
+
+    compress = commands.add_parser("compress", help="convert stored article bodies and report the size savings")
+    compress.add_argument("--codec", choices=["zlib", "zstd", "none"], help="default: DB_SETTINGS['content_compression']")
+    compress.add_argument("--no-vacuum", action="store_true", help="don't shrink the database file afterwards")
+
+    args = parser.parse_args()
+
+    if args.command == "scrape":
+        profile_ids = read_profile_ids(args.profile_ids, args.file)
+        if not profile_ids:
+            parser.error("no profile IDs given")
+        max_articles = float('inf') if args.all else args.max_articles
+        results = run_batch_scrape(
+            profile_ids,
+            processes=args.processes,
+            max_articles=max_articles,
+            incremental=args.incremental,
+            fetch_workers=args.fetch_workers
+        )
+        print_batch_summary(results)
+    elif args.command == "resume":
+        resume_scrape_job(job_id=args.job_id, journalist_id=args.journalist, headless=True)
+    elif args.command == "reparse":
+        reparse_cached_articles(args.journalist)
+    elif args.command == "backfill-keywords":
+        ensure_db()
+        count = backfill_article_keywords(args.journalist)
+        print(f"Rebuilt keywords for {count} articles.")
+    elif args.command == "compress":
+        ensure_db()
+        convert_article_content(args.codec, vacuum=not args.no_vacuum)
+
 if __name__ == "__main__":
-    run_scraper_pipeline("56-74-1533", max_articles=10)
\ No newline at end of file
+    main()
@@ -0,0 +1,49 @@
+import zlib
+
+# zstd is optional: it compresses about as well as zlib but decompresses
+# several times faster. Without the package only zlib is available.
+try:
+    import zstandard # type: ignore
+except ImportError:
+    zstandard = None
+
+# First byte of every compressed body says how the rest was compressed,
+# so rows written with different codecs can live in the same table.
+CODEC_IDS = {"zlib": 1, "zstd": 2}
+
+def available_codecs():
+    return [codec for codec in CODEC_IDS if codec != "zstd" or zstandard is not None]
+
+def compress_text(text, codec="zlib", level=None):
+    """Compresses a string into a codec-tagged BLOB."""
+    data = text.encode('utf-8')
+    if codec == "zlib":
+        body = zlib.compress(data, 6 if level is None else level)
+    elif codec == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd compression needs the 'zstandard' package")
+        body = zstandard.ZstdCompressor(level=3 if level is None else level).compress(data)
+    else:
+        raise ValueError(f"Unknown compression codec: {codec}")
+    return bytes([CODEC_IDS[codec]]) + body
+
+def decompress_text(blob):
+    """Inverse of compress_text. Returns None for a NULL blob."""
+    if blob is None:
+        return None
+    codec_id, body = blob[0], bytes(blob[1:])
+    if codec_id == CODEC_IDS["zlib"]:
+        data = zlib.decompress(body)
+    elif codec_id == CODEC_IDS["zstd"]:
+        if zstandard is None:
+            raise ValueError("Article was compressed with zstd, install the 'zstandard' package")
+        data = zstandard.ZstdDecompressor().decompress(body)
+    else:
+        raise ValueError(f"Unknown compression codec id: {codec_id}")
+    return data.decode('utf-8')
+
+def article_text(content, content_z):
+    """The article body from whichever column holds it (registered as a SQL function)."""
+    if content_z is not None:
+        return decompress_text(content_z)
+    return content
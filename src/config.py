@@ -5,7 +5,53 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DB_FOLDER = os.path.join(BASE_DIR, 'data')
 DB_NAME = 'yle_data.db'
 DB_PATH = os.path.join(DB_FOLDER, DB_NAME)
+HTML_CACHE_DIR = os.path.join(DB_FOLDER, 'html_cache')
 
 os.makedirs(DB_FOLDER, exist_ok=True)
 
-COLORS = ['#002858', '#054674', '#12CAB5', '#F0028D', '#8A278D', "#001631"]
\ No newline at end of file
+# --- DATABASE CONFIGURATION ---
+DB_SETTINGS = {
+    "busy_timeout_ms": 30000,      # how long a writer waits for another writer's lock
+    "mmap_size_mb": 256,           # memory-mapped I/O for reads
+    "cache_size_mb": 64,           # page cache per connection
+    "content_compression": None,   # None (plain text), "zlib" or "zstd"; see src.compression
+    "compression_level": None,     # None uses the codec's default level
+}
+
+COLORS = ['#002858', '#054674', '#12CAB5', '#F0028D', '#8A278D', "#001631"]
+
+# --- SCRAPER CONFIGURATION ---
+SCRAPER_SETTINGS = {
+    "fetch_workers": 8,            # concurrent article detail fetches
+    "requests_per_second": 4.0,    # token refill rate per host
+    "burst": 4,                    # token bucket capacity per host
+    "http_pool_size": 8,           # keep-alive connections kept per host
+    "http_retries": 3,             # retries on connection errors, 429 and 5xx
+    "http_backoff": 0.5,           # exponential backoff factor between retries (seconds)
+    "http_timeout": 10,            # per-request timeout (seconds)
+    "html_cache": True,            # keep raw article HTML on disk for revalidation/reparsing
+    "html_cache_max_mb": 500,      # least recently used pages are evicted above this size
+    "html_cache_touch_seconds": 600,   # cache hits refresh a page's access time at most this often
+    "incremental_stop_after": 20,  # incremental scrape stops after this many known articles in a row
+    # html.parser-strained extracts exactly what html.parser does. lxml repairs
+    # broken markup differently; only switch once benchmarks/bench_parsers.py
+    # reports 0 mismatches on saved Yle pages.
+    "parser_backend": "html.parser-strained",  # see src.scraper.PARSER_BACKENDS
+    "pipeline_queue_size": 50,     # articles waiting for detail fetch before the feed scrape pauses
+    "fetch_max_attempts": 5,       # detail fetches after which an article is given up on
+    "fetch_retry_base_seconds": 3600,  # first retry delay, doubled after every failure
+    "write_batch_size": 25,        # fetched articles written per transaction
+    "shared_rate_hosts": ["yle.fi"],   # hosts whose rate limit is shared by all CLI worker processes
+    "dashboard_scrape_workers": 2, # scrapes the dashboard runs at once in the background
+    "progress_poll_seconds": 2,    # how often the dashboard refreshes scrape progress
+}
+
+# --- DASHBOARD CONFIGURATION ---
+# Dates are shown, and filtered by, in the newsroom's time zone
+DISPLAY_TZ = "Europe/Helsinki"
+
+DASHBOARD_SETTINGS = {
+    "chart_renderer": "matplotlib", # default chart renderer: "matplotlib" (PNG) or "plotly" (browser only)
+    "chart_cache_entries": 64,      # articles whose rendered charts are kept in memory
+    "top_articles": 10,             # most viewed articles listed in the journalist overview
+}
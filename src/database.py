@@ -1,8 +1,123 @@
+import datetime
+import os
+import pathlib
+import re
 import sqlite3
-from src.config import DB_PATH
+import threading
+import time
+import unicodedata
+from src.config import DB_PATH, DB_SETTINGS, SCRAPER_SETTINGS
+from src.compression import article_text, compress_text
+
+# Articles still missing their body, metadata or publish date, on the
+# schema of migration 2 (before char_count/content_z existed). Work is
+# selected from article_fetch_state (idx_fetch_state_due) since then.
+_CONTENT_MISSING_METADATA_SQL = """
+    content IS NULL
+    OR content = ''
+    OR description IS NULL
+    OR published_date IS NULL
+"""
+
+_local = threading.local()
+_schema_ready = set()
+_shared_reader = None
+
+def _apply_pragmas(conn):
+    conn.execute(f"PRAGMA busy_timeout = {DB_SETTINGS['busy_timeout_ms']}")
+    conn.execute(f"PRAGMA mmap_size = {DB_SETTINGS['mmap_size_mb'] * 1024 * 1024}")
+    conn.execute(f"PRAGMA cache_size = -{DB_SETTINGS['cache_size_mb'] * 1024}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    register_sql_functions(conn)
+
+def register_sql_functions(conn):
+    """
+    Adds article_text(content, content_z) to a connection, for queries
+    that read article bodies whether or not they are compressed.
+    """
+    conn.create_function("article_text", 2, article_text, deterministic=True)
+
+def _thread_connection(name, connect):
+    """
+    Returns this thread's connection stored under `name`, creating it with
+    `connect()` on first use. Connections are re-created after a fork or
+    when DB_PATH changes, never shared between threads or processes.
+    """
+    key = (name, DB_PATH, os.getpid())
+    conn = getattr(_local, name, None)
+    if conn is None or getattr(_local, f"{name}_key", None) != key:
+        conn = connect()
+        setattr(_local, name, conn)
+        setattr(_local, f"{name}_key", key)
+    return conn
+
+def _connect_writer():
+    conn = sqlite3.connect(DB_PATH, timeout=DB_SETTINGS['busy_timeout_ms'] / 1000)
+    # WAL lets the dashboard read while a scrape is writing, and with
+    # synchronous=NORMAL a commit no longer waits for an fsync
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    _apply_pragmas(conn)
+    return conn
+
+def open_read_connection(check_same_thread=True):
+    """
+    Opens a new tuned read-only connection. Use check_same_thread=False for
+    one that is shared between threads (see set_shared_read_connection).
+    """
+    if not os.path.exists(DB_PATH):
+        ensure_db()
+    uri = pathlib.Path(DB_PATH).as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, timeout=DB_SETTINGS['busy_timeout_ms'] / 1000,
+                           check_same_thread=check_same_thread)
+    _apply_pragmas(conn)
+    return conn
 
 def get_db_connection():
-    return sqlite3.connect(DB_PATH)
+    """
+    Returns the calling thread's long-lived read/write connection.
+    Callers commit but never close it; see close_db_connections.
+    """
+    return _thread_connection("writer", _connect_writer)
+
+def get_read_connection():
+    """
+    Returns the calling thread's long-lived read-only connection, or the
+    process-wide one if set_shared_read_connection was called.
+    In WAL mode readers never wait for a writer, so the dashboard stays
+    responsive while a scrape is running.
+    """
+    if _shared_reader is not None and _shared_reader[:2] == (DB_PATH, os.getpid()):
+        return _shared_reader[2]
+    return _thread_connection("reader", open_read_connection)
+
+def set_shared_read_connection(conn):
+    """
+    Makes get_read_connection return `conn` in every thread of this
+    process. For callers whose threads are short-lived (Streamlit runs
+    every rerun on a new thread), where a per-thread connection would be
+    reopened on nearly every call. `conn` must come from
+    open_read_connection(check_same_thread=False); it is read-only, so
+    sharing it between threads is safe.
+    """
+    global _shared_reader
+    _shared_reader = (DB_PATH, os.getpid(), conn)
+
+def close_db_connections():
+    """Closes the calling thread's connections (they reopen on next use)."""
+    for name in ("writer", "reader"):
+        conn = getattr(_local, name, None)
+        if conn is not None and getattr(_local, f"{name}_key", (None, None, None))[2] == os.getpid():
+            conn.close()
+        setattr(_local, name, None)
+
+def ensure_db():
+    """Creates and upgrades the schema once per process and database file."""
+    if DB_PATH in _schema_ready:
+        return
+    init_db()
+    upgrade_db_schema()
+    _schema_ready.add(DB_PATH)
 
 def init_db():
     conn = get_db_connection()
@@ -31,79 +146,979 @@ def init_db():
     )
     ''')
     conn.commit()
-    conn.close()
-    
+
+# --- Schema migrations ---
+# Each migration runs once, in order, inside its own transaction.
+# The schema version is kept in PRAGMA user_version.
+
+def _add_missing_columns(cursor, table, columns):
+    cursor.execute(f"PRAGMA table_info({table})")
+    existing = {row[1] for row in cursor.fetchall()}
+    for name, col_type in columns:
+        if name not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {col_type}")
+            print(f"Added column: {name}")
+
+def _migration_article_metadata_columns(cursor):
+    # databases from before description/keywords/published_date were scraped
+    _add_missing_columns(cursor, "articles", [
+        ("description", "TEXT"),
+        ("keywords", "TEXT"),
+        ("published_date", "TEXT"),
+    ])
+
+def _migration_fetch_state(cursor):
+    # Detail fetch bookkeeping: status is pending | failed | done | dead
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS article_fetch_state (
+        article_id TEXT PRIMARY KEY,
+        journalist_id TEXT,
+        status TEXT NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        last_error TEXT,
+        next_retry_at REAL NOT NULL DEFAULT 0,
+        updated_at REAL,
+        FOREIGN KEY (article_id) REFERENCES articles (id)
+    )
+    ''')
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_fetch_state_due
+    ON article_fetch_state (journalist_id, status, next_retry_at)
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_articles_delete_fetch_state
+    AFTER DELETE ON articles
+    BEGIN
+        DELETE FROM article_fetch_state WHERE article_id = old.id;
+    END
+    ''')
+    # Track articles saved before the fetch state table existed
+    cursor.execute(f'''
+    INSERT OR IGNORE INTO article_fetch_state (article_id, journalist_id, status, updated_at)
+    SELECT id, journalist_id, CASE WHEN {_CONTENT_MISSING_METADATA_SQL} THEN 'pending' ELSE 'done' END, ?
+    FROM articles
+    ''', (time.time(),))
+
+def _migration_scrape_jobs(cursor):
+    # Scrape runs and their checkpoints, so a crashed run can be resumed
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS scrape_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        journalist_id TEXT,
+        max_articles INTEGER,
+        incremental INTEGER NOT NULL DEFAULT 0,
+        status TEXT NOT NULL DEFAULT 'running',
+        feed_depth INTEGER NOT NULL DEFAULT 0,
+        feed_card_offset INTEGER NOT NULL DEFAULT 0,
+        feed_done INTEGER NOT NULL DEFAULT 0,
+        articles_discovered INTEGER NOT NULL DEFAULT 0,
+        details_completed INTEGER NOT NULL DEFAULT 0,
+        details_failed INTEGER NOT NULL DEFAULT 0,
+        last_error TEXT,
+        created_at REAL,
+        updated_at REAL
+    )
+    ''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS scrape_job_articles (
+        job_id INTEGER,
+        article_id TEXT,
+        PRIMARY KEY (job_id, article_id),
+        FOREIGN KEY (job_id) REFERENCES scrape_jobs (id)
+    )
+    ''')
+
+def _migration_journalist_date_index(cursor):
+    # per-journalist article lists (dashboard, RAG ingestion), newest first
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_articles_journalist_published
+    ON articles (journalist_id, published_date)
+    ''')
+
+def _migration_article_keywords(cursor):
+    # One row per (article, keyword); journalist_id is copied in so the
+    # per-journalist top keywords are a covering index scan. Keywords are
+    # counted by keyword_key (casefolded, see keyword_key()); `keyword`
+    # keeps the form the article used, for display.
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS article_keywords (
+        article_id TEXT,
+        journalist_id TEXT,
+        keyword_key TEXT,
+        keyword TEXT,
+        PRIMARY KEY (article_id, keyword_key),
+        FOREIGN KEY (article_id) REFERENCES articles (id)
+    )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_article_keywords_keyword ON article_keywords (keyword_key, keyword)")
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_article_keywords_journalist
+    ON article_keywords (journalist_id, keyword_key, keyword)
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_articles_delete_keywords
+    AFTER DELETE ON articles
+    BEGIN
+        DELETE FROM article_keywords WHERE article_id = old.id;
+    END
+    ''')
+    cursor.execute("SELECT id, keywords FROM articles WHERE keywords IS NOT NULL AND keywords != ''")
+    _write_article_keywords(cursor, cursor.fetchall())
+
+def _migration_compressed_content(cursor):
+    # content_z holds the body as a compressed BLOB (see src.compression),
+    # char_count its length, so listing articles never reads the body
+    _add_missing_columns(cursor, "articles", [
+        ("content_z", "BLOB"),
+        ("char_count", "INTEGER"),
+    ])
+    cursor.execute("UPDATE articles SET char_count = length(content) WHERE content IS NOT NULL")
+
+def _migration_full_text_search(cursor):
+    # Contentless FTS5 index: it keeps only the index, no body is stored
+    # twice. Plain-text rows are kept in sync by these triggers, compressed
+    # rows by Python code; see "Full-text search" below for the whole scheme.
+    # articles has no INTEGER PRIMARY KEY, so run rebuild_search_index()
+    # after a VACUUM (which may renumber rowids).
+    cursor.execute('''
+    CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+        title, description, content, keywords,
+        content=''
+    )
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_articles_fts_insert
+    AFTER INSERT ON articles
+    WHEN new.content_z IS NULL
+    BEGIN
+        INSERT INTO articles_fts (rowid, title, description, content, keywords)
+        VALUES (new.rowid, new.title, new.description, new.content, new.keywords);
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_articles_fts_update
+    AFTER UPDATE OF title, description, content, content_z, keywords ON articles
+    BEGIN
+        INSERT INTO articles_fts (articles_fts, rowid, title, description, content, keywords)
+        SELECT 'delete', old.rowid, old.title, old.description, old.content, old.keywords
+        WHERE old.content_z IS NULL;
+        INSERT INTO articles_fts (rowid, title, description, content, keywords)
+        SELECT new.rowid, new.title, new.description, new.content, new.keywords
+        WHERE new.content_z IS NULL;
+    END
+    ''')
+    # a compressed row's index entry can only be removed with its text,
+    # which plain SQL can't decompress: refuse instead of corrupting
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_articles_fts_guard_delete
+    BEFORE DELETE ON articles
+    WHEN old.content_z IS NOT NULL
+    BEGIN
+        SELECT RAISE(ABORT, 'compressed article: delete it with src.database.delete_articles()');
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_articles_fts_delete
+    AFTER DELETE ON articles
+    BEGIN
+        INSERT INTO articles_fts (articles_fts, rowid, title, description, content, keywords)
+        VALUES ('delete', old.rowid, old.title, old.description, old.content, old.keywords);
+    END
+    ''')
+    # every body is still plain text here, no decompression needed
+    cursor.execute('''
+    INSERT INTO articles_fts (rowid, title, description, content, keywords)
+    SELECT rowid, title, description, content, keywords FROM articles
+    ''')
+
+    if DB_SETTINGS['content_compression']:
+        _convert_content(cursor, DB_SETTINGS['content_compression'])
+
+def _migration_published_ts(cursor):
+    # published_date keeps the raw meta tag string, published_ts the same
+    # moment as UTC epoch seconds for sorting and date-range filters
+    _add_missing_columns(cursor, "articles", [("published_ts", "INTEGER")])
+    cursor.execute("SELECT id, published_date FROM articles WHERE published_date IS NOT NULL")
+    cursor.executemany(
+        "UPDATE articles SET published_ts = ? WHERE id = ?",
+        [(parse_published_ts(published_date), a_id) for a_id, published_date in cursor.fetchall()]
+    )
+    cursor.execute("DROP INDEX IF EXISTS idx_articles_journalist_published")
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_articles_journalist_published_ts
+    ON articles (journalist_id, published_ts)
+    ''')
+
+def _migration_journalist_stats(cursor):
+    # Per-journalist totals kept up to date by triggers, so the dashboard
+    # header never aggregates over articles. `version` goes up on every
+    # change to one of the journalist's articles.
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS journalist_stats (
+        journalist_id TEXT PRIMARY KEY,
+        article_count INTEGER NOT NULL DEFAULT 0,
+        total_chars INTEGER NOT NULL DEFAULT 0,
+        content_count INTEGER NOT NULL DEFAULT 0,
+        latest_ts INTEGER,
+        version INTEGER NOT NULL DEFAULT 0,
+        FOREIGN KEY (journalist_id) REFERENCES journalists (id)
+    )
+    ''')
+    # latest_ts is re-read through idx_articles_journalist_published_ts,
+    # a single index lookup, because a delete can't be applied as a delta
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_articles_stats_insert
+    AFTER INSERT ON articles
+    BEGIN
+        INSERT INTO journalist_stats (journalist_id, article_count, total_chars, content_count, latest_ts, version)
+        VALUES (new.journalist_id, 1, COALESCE(new.char_count, 0), COALESCE(new.char_count, 0) > 0, new.published_ts, 1)
+        ON CONFLICT (journalist_id) DO UPDATE SET
+            article_count = article_count + 1,
+            total_chars = total_chars + excluded.total_chars,
+            content_count = content_count + excluded.content_count,
+            latest_ts = (SELECT MAX(published_ts) FROM articles WHERE journalist_id = new.journalist_id),
+            version = version + 1;
+    END
+    ''')
+    # articles never move between journalists, so old and new share one row
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_articles_stats_update
+    AFTER UPDATE ON articles
+    BEGIN
+        UPDATE journalist_stats SET
+            total_chars = total_chars + COALESCE(new.char_count, 0) - COALESCE(old.char_count, 0),
+            content_count = content_count + (COALESCE(new.char_count, 0) > 0) - (COALESCE(old.char_count, 0) > 0),
+            latest_ts = (SELECT MAX(published_ts) FROM articles WHERE journalist_id = new.journalist_id),
+            version = version + 1
+        WHERE journalist_id = new.journalist_id;
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_articles_stats_delete
+    AFTER DELETE ON articles
+    BEGIN
+        UPDATE journalist_stats SET
+            article_count = article_count - 1,
+            total_chars = total_chars - COALESCE(old.char_count, 0),
+            content_count = content_count - (COALESCE(old.char_count, 0) > 0),
+            latest_ts = (SELECT MAX(published_ts) FROM articles WHERE journalist_id = old.journalist_id),
+            version = version + 1
+        WHERE journalist_id = old.journalist_id;
+    END
+    ''')
+    _rebuild_journalist_stats(cursor)
+
+MIGRATIONS = [
+    (1, "article metadata columns", _migration_article_metadata_columns),
+    (2, "article fetch state", _migration_fetch_state),
+    (3, "scrape jobs", _migration_scrape_jobs),
+    (4, "journalist/published date index", _migration_journalist_date_index),
+    (5, "article keywords table", _migration_article_keywords),
+    (6, "compressed article content", _migration_compressed_content),
+    (7, "full-text search index", _migration_full_text_search),
+    (8, "published timestamp column", _migration_published_ts),
+    (9, "journalist stats table", _migration_journalist_stats),
+]
+
+def get_schema_version():
+    return get_db_connection().execute("PRAGMA user_version").fetchone()[0]
+
 def upgrade_db_schema():
-    """Adds new columns to the database."""
+    """
+    Applies the migrations newer than the database's PRAGMA user_version.
+    Returns the number of migrations applied.
+    """
     conn = get_db_connection()
     cursor = conn.cursor()
+    applied = 0
     
-    try:
-        cursor.execute("ALTER TABLE articles ADD COLUMN description TEXT")
-        print("Added column: description")
-    except sqlite3.OperationalError:
-        pass # Column already exists
+    for version, description, migrate in MIGRATIONS:
+        if version <= get_schema_version():
+            continue
+        # IMMEDIATE takes the write lock up front, so two processes
+        # starting at once can't both run the same migration
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            if version <= get_schema_version():
+                conn.rollback()
+                continue
+            migrate(cursor)
+            cursor.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        print(f"Applied migration {version}: {description}")
+        applied += 1
+    
+    return applied
 
-    try:
-        cursor.execute("ALTER TABLE articles ADD COLUMN keywords TEXT")
-        print("Added column: keywords")
-    except sqlite3.OperationalError:
-        pass # Column already exists
-    # Check for published_date 
-    try:
-        cursor.execute("ALTER TABLE articles ADD COLUMN published_date TEXT")
-        print("Added column: published_date")
-    except sqlite3.OperationalError:
-        pass
+def upsert_articles(journalist_id, articles):
+    """
+    Inserts or updates a batch of feed articles in a single transaction.
+    Existing articles only get their title/url refreshed.
+    Returns (inserted_articles, updated_count).
+    """
+    unique = {}
+    for article in articles:
+        unique[article['id']] = article
+    if not unique:
+        return [], 0
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    ids = list(unique)
+    existing = set()
+    retitled = []
+    for i in range(0, len(ids), 500):
+        chunk = ids[i:i + 500]
+        cursor.execute(f"SELECT id, title, content_z IS NOT NULL FROM articles WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+        for a_id, title, compressed in cursor.fetchall():
+            existing.add(a_id)
+            if compressed and title != unique[a_id]['name']:
+                retitled.append(a_id)
+    inserted = [a for a_id, a in unique.items() if a_id not in existing]
+    # a new title of a compressed article is indexed here (see "Full-text search")
+    old_index_rows = _compressed_search_rows(cursor, retitled)
+    _search_index_delete(cursor, old_index_rows)
+
+    cursor.executemany('''
+    INSERT INTO articles (id, title, url, journalist_id)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET title = excluded.title, url = excluded.url
+    WHERE articles.title IS NOT excluded.title OR articles.url IS NOT excluded.url
+    ''', [(a['id'], a['name'], a['url'], journalist_id) for a in unique.values()])
+    # rowcount only counts rows this statement wrote, not the search index
+    # and stats rows the triggers write (conn.total_changes would)
+    updated_count = cursor.rowcount - len(inserted)
+    _search_index_insert(cursor, [
+        (rowid, unique[a_id]['name'], description, text, keywords)
+        for rowid, a_id, _, description, text, keywords in old_index_rows
+    ])
 
+    now = time.time()
+    cursor.executemany('''
+    INSERT OR IGNORE INTO article_fetch_state (article_id, journalist_id, status, updated_at)
+    VALUES (?, ?, 'pending', ?)
+    ''', [(a['id'], journalist_id, now) for a in inserted])
     conn.commit()
-    conn.close()
+    return inserted, updated_count
 
 def save_articles(journalist_id, articles):
+    """Inserts new articles. Returns the ones that were not in the database yet."""
+    new_articles, _ = upsert_articles(journalist_id, articles)
+    print(f"Saved {len(new_articles)} new articles to database.")
+    return new_articles
+
+def get_due_articles(journalist_id, limit=None):
+    """
+    Returns articles of one journalist whose detail fetch is due:
+    never attempted, or failed earlier and past their retry time.
+    """
     conn = get_db_connection()
     cursor = conn.cursor()
-    count = 0
-    for article in articles:
-        try:
-            cursor.execute('''
-            INSERT INTO articles (id, title, url, journalist_id)
-            VALUES (?, ?, ?, ?)
-            ''', (article['id'], article['name'], article['url'], journalist_id))
-            count += 1
-        except sqlite3.IntegrityError:
-            pass
+    query = '''
+        SELECT a.id, a.url
+        FROM article_fetch_state s
+        JOIN articles a ON a.id = s.article_id
+        WHERE s.journalist_id = ?
+          AND s.status IN ('pending', 'failed')
+          AND s.next_retry_at <= ?
+        ORDER BY s.next_retry_at
+    '''
+    params = [journalist_id, time.time()]
+    if limit:
+        query += " LIMIT ?"
+        params.append(limit)
+    cursor.execute(query, params)
+    rows = cursor.fetchall()
+    return [{"id": row[0], "url": row[1]} for row in rows]
+
+def record_fetch_failures(failures):
+    """
+    Counts failed detail fetches, given as (article_id, error) pairs.
+    Retries back off exponentially (fetch_retry_base_seconds * 2^(attempts-1));
+    after fetch_max_attempts the article is marked dead and never retried.
+    """
+    max_attempts = SCRAPER_SETTINGS['fetch_max_attempts']
+    base_delay = SCRAPER_SETTINGS['fetch_retry_base_seconds']
+    now = time.time()
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.executemany('''
+        UPDATE article_fetch_state
+        SET attempts = attempts + 1,
+            status = CASE WHEN attempts + 1 >= ? THEN 'dead' ELSE 'failed' END,
+            last_error = ?,
+            next_retry_at = ? + ? * (1 << attempts),
+            updated_at = ?
+        WHERE article_id = ?
+    ''', [(max_attempts, str(error), now, base_delay, now, article_id) for article_id, error in failures])
     conn.commit()
-    conn.close()
-    print(f"Saved {count} new articles to database.")
 
-def get_articles_missing_metadata():
-    """Returns articles that are missing content, metadata, OR the published date."""
+def record_fetch_failure(article_id, error):
+    record_fetch_failures([(article_id, error)])
+
+def get_known_article_ids(journalist_id):
+    """Returns the set of article IDs already stored for a journalist."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT id FROM articles WHERE journalist_id = ?", (journalist_id,))
+    rows = cursor.fetchall()
+    return {row[0] for row in rows}
+
+def get_article_urls(journalist_id=None):
+    """Returns id and url of every article, optionally for one journalist only."""
     conn = get_db_connection()
     cursor = conn.cursor()
-    cursor.execute("""
-                   SELECT id, url
-                   FROM articles
-                   WHERE content IS NULL
-                    OR content = ''
-                    OR description IS NULL
-                    OR published_date IS NULL
-    """)
+    if journalist_id:
+        cursor.execute("SELECT id, url FROM articles WHERE journalist_id = ?", (journalist_id,))
+    else:
+        cursor.execute("SELECT id, url FROM articles")
     rows = cursor.fetchall()
-    conn.close()
     return [{"id": row[0], "url": row[1]} for row in rows]
 
-def update_article_full_data(article_id, content, description, keywords, published_date):
-    """Updates article body and metadata"""
+def update_articles_full_data(rows):
+    """
+    Updates body and metadata of many articles in one transaction.
+    `rows` are dicts with id, content, description, keywords, published_date.
+    Returns the number of articles updated.
+    """
+    if not rows:
+        return 0
     conn = get_db_connection()
     cursor = conn.cursor()
-    cursor.execute('''
+    codec = DB_SETTINGS['content_compression']
+    # compressed articles are re-indexed here (see "Full-text search")
+    _search_index_delete(cursor, _compressed_search_rows(cursor, [r['id'] for r in rows]))
+    params = []
+    for r in rows:
+        content, content_z = _stored_content(r['content'], codec)
+        params.append((
+            content, content_z, len(r['content'] or ""), r['description'], r['keywords'],
+            r['published_date'], parse_published_ts(r['published_date']), r['id']
+        ))
+    cursor.executemany('''
         UPDATE articles 
-        SET content = ?, description = ?, keywords = ?, published_date = ?
+        SET content = ?, content_z = ?, char_count = ?, description = ?, keywords = ?,
+            published_date = ?, published_ts = ?
         WHERE id = ?
-    ''', (content, description, keywords, published_date, article_id))
+    ''', params)
+    updated_count = cursor.rowcount
+    if codec:
+        _index_compressed_content(cursor, rows)
+    now = time.time()
+    cursor.executemany('''
+        UPDATE article_fetch_state
+        SET status = 'done', attempts = attempts + 1, last_error = NULL, updated_at = ?
+        WHERE article_id = ?
+    ''', [(now, r['id']) for r in rows])
+    _write_article_keywords(cursor, [(r['id'], r['keywords']) for r in rows])
     conn.commit()
-    conn.close()
+    return updated_count
+
+def update_article_full_data(article_id, content, description, keywords, published_date):
+    """Updates article body and metadata"""
+    update_articles_full_data([{
+        "id": article_id,
+        "content": content,
+        "description": description,
+        "keywords": keywords,
+        "published_date": published_date,
+    }])
+
+def delete_articles(article_ids=None, journalist_id=None):
+    """
+    Deletes the given articles, or all articles of `journalist_id`, with
+    their search index entries, fetch state, keywords and stats.
+    Use this instead of DELETE FROM articles, which is refused for
+    compressed articles (see "Full-text search").
+    Returns the number of articles deleted.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    if journalist_id:
+        cursor.execute("SELECT id FROM articles WHERE journalist_id = ?", (journalist_id,))
+        article_ids = [row[0] for row in cursor.fetchall()]
+    elif article_ids is None:
+        raise ValueError("delete_articles needs article_ids or a journalist_id")
+    ids = list(article_ids)
+    
+    _search_index_delete(cursor, _compressed_search_rows(cursor, ids))
+    deleted = 0
+    for i in range(0, len(ids), 500):
+        chunk = ids[i:i + 500]
+        placeholders = ','.join('?' * len(chunk))
+        # clearing content_z lets the delete through; the update trigger
+        # indexes the now body-less rows and the delete trigger removes them
+        cursor.execute(f"UPDATE articles SET content_z = NULL WHERE id IN ({placeholders}) AND content_z IS NOT NULL", chunk)
+        cursor.execute(f"DELETE FROM articles WHERE id IN ({placeholders})", chunk)
+        deleted += cursor.rowcount
+    conn.commit()
+    return deleted
+    
+# --- Publish dates ---
+
+def parse_published_ts(value):
+    """
+    Converts an article:published_time string (ISO 8601) to UTC epoch
+    seconds. Returns None when the value is missing or unparseable.
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        # Yle always sends an offset; treat anything else as UTC
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return int(parsed.timestamp())
+
+def to_epoch(value):
+    """UTC epoch seconds from an epoch number, a date/datetime or an ISO string."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return int(value.timestamp())
+    if isinstance(value, datetime.date):
+        return int(datetime.datetime(value.year, value.month, value.day, tzinfo=datetime.timezone.utc).timestamp())
+    return parse_published_ts(value)
+
+def get_published_range(journalist_id=None):
+    """Returns (first, last) published_ts of a journalist's articles (or all), None if unknown."""
+    conn = get_read_connection()
+    cursor = conn.cursor()
+    if journalist_id:
+        cursor.execute("SELECT MIN(published_ts), MAX(published_ts) FROM articles WHERE journalist_id = ?", (journalist_id,))
+    else:
+        cursor.execute("SELECT MIN(published_ts), MAX(published_ts) FROM articles")
+    first, last = cursor.fetchone()
+    if first is None:
+        return None
+    return first, last
+
+def _published_between(conditions, params, start, end, column="published_ts"):
+    if start is not None:
+        conditions.append(f"{column} >= ?")
+        params.append(to_epoch(start))
+    if end is not None:
+        conditions.append(f"{column} < ?")
+        params.append(to_epoch(end))
+
+def get_articles_published_between(journalist_id=None, start=None, end=None, limit=None, offset=0):
+    """
+    Returns the articles published in [start, end), newest first, without
+    their bodies. With neither bound set, undated articles are included too.
+    `limit`/`offset` return one page, walked along the journalist/date index.
+    """
+    conn = get_read_connection()
+    cursor = conn.cursor()
+    conditions, params = [], []
+    if journalist_id:
+        conditions.append("journalist_id = ?")
+        params.append(journalist_id)
+    _published_between(conditions, params, start, end)
+    sql = '''
+    SELECT id, title, url, published_date, published_ts, char_count, description, keywords, journalist_id
+    FROM articles
+    '''
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY published_ts DESC, rowid DESC"
+    if limit is not None:
+        sql += " LIMIT ? OFFSET ?"
+        params += [limit, offset]
     
+    cursor.execute(sql, params)
+    columns = [col[0] for col in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+def count_articles_published_between(journalist_id=None, start=None, end=None):
+    """Number of articles get_articles_published_between would return without a limit."""
+    conn = get_read_connection()
+    cursor = conn.cursor()
+    conditions, params = [], []
+    if journalist_id:
+        conditions.append("journalist_id = ?")
+        params.append(journalist_id)
+    _published_between(conditions, params, start, end)
+    sql = "SELECT COUNT(*) FROM articles"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    cursor.execute(sql, params)
+    return cursor.fetchone()[0]
+
+# --- Content storage ---
+
+def _stored_content(text, codec):
+    """Returns the (content, content_z) pair to store for an article body."""
+    if text and codec:
+        return None, compress_text(text, codec, DB_SETTINGS['compression_level'])
+    return text, None
+
+def _convert_content(cursor, codec, chunk_size=500):
+    """
+    Rewrites every article body with `codec` (None stores plain text).
+    Returns (bytes_before, bytes_after) of the stored bodies.
+    """
+    before = cursor.execute(
+        "SELECT COALESCE(SUM(COALESCE(length(CAST(content AS BLOB)), length(content_z))), 0) FROM articles"
+    ).fetchone()[0]
+    index_before = _search_index_bytes(cursor)
+    
+    last_rowid = 0
+    while True:
+        cursor.execute('''
+            SELECT rowid, title, description, article_text(content, content_z), keywords, content_z IS NOT NULL
+            FROM articles
+            WHERE rowid > ? AND (content IS NOT NULL OR content_z IS NOT NULL)
+            ORDER BY rowid LIMIT ?
+        ''', (last_rowid, chunk_size))
+        rows = cursor.fetchall()
+        if not rows:
+            break
+        # the triggers index plain-text rows, compressed ones are done
+        # here (see "Full-text search")
+        _search_index_delete(cursor, [row[:5] for row in rows if row[5]])
+        cursor.executemany(
+            "UPDATE articles SET content = ?, content_z = ?, char_count = ? WHERE rowid = ?",
+            [(*_stored_content(row[3], codec), len(row[3] or ""), row[0]) for row in rows]
+        )
+        _search_index_insert(cursor, [row[:5] for row in rows if row[3] and codec])
+        last_rowid = rows[-1][0]
+    
+    after = cursor.execute(
+        "SELECT COALESCE(SUM(COALESCE(length(CAST(content AS BLOB)), length(content_z))), 0) FROM articles"
+    ).fetchone()[0]
+    index_after = _search_index_bytes(cursor)
+    ratio = after / before if before else 1
+    total_ratio = (after + index_after) / (before + index_before) if before + index_before else 1
+    print(f"Article bodies: {before / 1024 / 1024:.1f} MB -> {after / 1024 / 1024:.1f} MB ({ratio:.0%} of the original, {codec or 'plain text'})")
+    print(f"Search index: {index_before / 1024 / 1024:.1f} MB -> {index_after / 1024 / 1024:.1f} MB")
+    print(f"Bodies and index: {(before + index_before) / 1024 / 1024:.1f} MB -> {(after + index_after) / 1024 / 1024:.1f} MB ({total_ratio:.0%} of the original)")
+    return before, after
+
+def _search_index_bytes(cursor):
+    """Bytes stored in the FTS5 shadow tables (articles_fts_data, _idx, _docsize, ...)."""
+    cursor.execute(r"SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'articles\_fts\_%' ESCAPE '\'")
+    total = 0
+    for (table,) in cursor.fetchall():
+        columns = [row[1] for row in cursor.execute(f"PRAGMA table_info({table})").fetchall()]
+        lengths = " + ".join(f"COALESCE(length(CAST({column} AS BLOB)), 0)" for column in columns)
+        total += cursor.execute(f"SELECT COALESCE(SUM({lengths}), 0) FROM {table}").fetchone()[0]
+    return total
+
+def convert_article_content(codec=None, vacuum=True):
+    """
+    Stores all article bodies with `codec` ("zlib", "zstd" or "none" for
+    plain text; defaults to DB_SETTINGS['content_compression']) and reports
+    the savings. With vacuum the freed pages are returned to the file system.
+    Returns (bytes_before, bytes_after).
+    """
+    if codec is None:
+        codec = DB_SETTINGS['content_compression']
+    if codec == "none":
+        codec = None
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    result = _convert_content(cursor, codec)
+    conn.commit()
+    if vacuum:
+        file_before = os.path.getsize(DB_PATH)
+        conn.execute("VACUUM")
+        # VACUUM may renumber the rowids the search index refers to
+        rebuild_search_index()
+        print(f"Database file: {file_before / 1024 / 1024:.1f} MB -> {os.path.getsize(DB_PATH) / 1024 / 1024:.1f} MB")
+    return result
+
+# --- Keywords ---
+
+def keyword_key(keyword):
+    """
+    The form keywords are grouped and counted by, so "Vaalit" and "vaalit"
+    are one keyword. casefold() rather than SQLite's NOCASE, which only
+    folds ASCII and would keep "Äänestys" and "äänestys" apart.
+    """
+    return keyword.casefold()
+
+def split_keywords(keywords):
+    """Splits the comma-separated keywords meta string into unique (by keyword_key), trimmed keywords."""
+    if not keywords:
+        return []
+    unique = {}
+    for keyword in keywords.split(","):
+        keyword = " ".join(keyword.split())
+        if keyword:
+            unique.setdefault(keyword_key(keyword), keyword)
+    return list(unique.values())
+
+def _write_article_keywords(cursor, rows):
+    """Replaces the keyword rows of the given (article_id, keywords) pairs."""
+    cursor.executemany("DELETE FROM article_keywords WHERE article_id = ?", [(a_id,) for a_id, _ in rows])
+    cursor.executemany('''
+        INSERT OR IGNORE INTO article_keywords (article_id, journalist_id, keyword_key, keyword)
+        SELECT id, journalist_id, ?, ? FROM articles WHERE id = ?
+    ''', [(keyword_key(keyword), keyword, a_id) for a_id, keywords in rows for keyword in split_keywords(keywords)])
+
+def backfill_article_keywords(journalist_id=None):
+    """
+    Rebuilds article_keywords from articles.keywords.
+    Returns the number of articles processed.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    if journalist_id:
+        cursor.execute("SELECT id, keywords FROM articles WHERE journalist_id = ?", (journalist_id,))
+    else:
+        cursor.execute("SELECT id, keywords FROM articles")
+    rows = cursor.fetchall()
+    _write_article_keywords(cursor, rows)
+    conn.commit()
+    return len(rows)
+
+def get_top_keywords(journalist_id=None, start=None, end=None, limit=10):
+    """
+    Returns the most used keywords as [{"keyword", "count"}], optionally for
+    one journalist and for articles published between `start` and `end`
+    (anything to_epoch accepts; `end` is exclusive). Keywords that differ
+    only in case are counted together and shown in one of their forms.
+    """
+    conn = get_read_connection()
+    cursor = conn.cursor()
+    conditions, params = [], []
+    if journalist_id:
+        conditions.append("k.journalist_id = ?")
+        params.append(journalist_id)
+    if start or end:
+        # the time window needs the publish date from articles
+        sql = "SELECT MIN(k.keyword), COUNT(*) FROM article_keywords k JOIN articles a ON a.id = k.article_id"
+        if start:
+            conditions.append("a.published_ts >= ?")
+            params.append(to_epoch(start))
+        if end:
+            conditions.append("a.published_ts < ?")
+            params.append(to_epoch(end))
+    else:
+        sql = "SELECT MIN(k.keyword), COUNT(*) FROM article_keywords k"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " GROUP BY k.keyword_key ORDER BY COUNT(*) DESC, k.keyword_key LIMIT ?"
+    params.append(limit)
+    
+    cursor.execute(sql, params)
+    return [{"keyword": row[0], "count": row[1]} for row in cursor.fetchall()]
+
+# --- Full-text search ---
+# articles_fts is a contentless FTS5 index (content=''): it stores no text
+# of its own, and its rowids are those of `articles`. Keeping it in sync:
+#
+# - Plain-text rows (content_z NULL) are handled by the triggers of
+#   _migration_full_text_search, which only read plain columns and so
+#   work on any connection.
+# - Compressed rows (content NULL) can't be handled by triggers: FTS5
+#   needs the text to add a row and the exact same text to remove it,
+#   and only Python can decompress. The triggers skip these rows, and
+#   every code path that changes one updates the index itself with
+#   _search_index_delete/_search_index_insert: upsert_articles (new
+#   title), update_articles_full_data (new body), _convert_content
+#   (rows switching between plain and compressed) and delete_articles.
+# - Deleting a compressed row with plain SQL is refused by a trigger;
+#   use delete_articles().
+# - A contentless index can't return the text for snippet(), so search
+#   snippets are built in Python (_snippet) for the returned hits only.
+#
+# Any new code that writes title, description, content, content_z or
+# keywords of articles must follow the same rules.
+
+# BM25 column weights: title, description, content, keywords
+SEARCH_WEIGHTS = (10.0, 5.0, 1.0, 5.0)
+
+def _fts_query(query):
+    """
+    Turns free text into a safe FTS5 query: every word must match, as a
+    prefix so that Finnish inflections (e.g. "vaali" -> "vaalit") are found.
+    """
+    words = re.findall(r"\w+", query)
+    return " ".join(f'"{word}"*' for word in words)
+
+def _fold(word):
+    """Lowercases and strips diacritics, like the FTS5 unicode61 tokenizer."""
+    decomposed = unicodedata.normalize("NFKD", word.casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+def _snippet(fields, query, size=16):
+    """
+    Builds a search snippet like FTS5 snippet(): the window of `size` words
+    with the most query matches, from the field that has the most of them,
+    matches wrapped in ** and cut ends marked with "…".
+    """
+    prefixes = tuple(_fold(word) for word in re.findall(r"\w+", query))
+    best = None
+    for text in fields:
+        if not text:
+            continue
+        tokens = list(re.finditer(r"\w+", text))
+        hits = [i for i, token in enumerate(tokens) if _fold(token.group()).startswith(prefixes)]
+        if best is None:
+            best = (0, text, tokens, set(), 0)
+        for first in hits:
+            start = max(0, min(first - 2, len(tokens) - size))
+            in_window = sum(1 for i in hits if start <= i < start + size)
+            if in_window > best[0]:
+                best = (in_window, text, tokens, set(hits), start)
+    if best is None or not best[2]:
+        return ""
+    _, text, tokens, hits, start = best
+    end = min(len(tokens), start + size)
+    parts = ["…"] if start > 0 else []
+    position = tokens[start].start()
+    for i in range(start, end):
+        token = tokens[i]
+        parts.append(text[position:token.start()])
+        parts.append(f"**{token.group()}**" if i in hits else token.group())
+        position = token.end()
+    if end < len(tokens):
+        parts.append("…")
+    else:
+        parts.append(text[position:])
+    return "".join(parts).strip()
+
+def _search_filter(match, journalist_id, start, end):
+    """WHERE clause and params shared by search_articles and count_search_matches."""
+    conditions, params = ["articles_fts MATCH ?"], [match]
+    if journalist_id:
+        conditions.append("a.journalist_id = ?")
+        params.append(journalist_id)
+    _published_between(conditions, params, start, end, column="a.published_ts")
+    return " AND ".join(conditions), params
+
+def count_search_matches(query, journalist_id=None, start=None, end=None):
+    """Number of articles search_articles would return without a limit."""
+    match = _fts_query(query)
+    if not match:
+        return 0
+    conn = get_read_connection()
+    cursor = conn.cursor()
+    where, params = _search_filter(match, journalist_id, start, end)
+    cursor.execute(f'''
+    SELECT COUNT(*) FROM articles_fts
+    JOIN articles a ON a.rowid = articles_fts.rowid
+    WHERE {where}
+    ''', params)
+    return cursor.fetchone()[0]
+
+def search_articles(query, journalist_id=None, limit=20, start=None, end=None):
+    """
+    Full-text search over title, description, content and keywords,
+    optionally limited to articles published in [start, end).
+    Returns the best matches first (BM25), each with a highlighted snippet.
+    Snippets are built in Python (see _snippet), so only the returned
+    articles have their bodies read and decompressed.
+    """
+    match = _fts_query(query)
+    if not match:
+        return []
+    
+    conn = get_read_connection()
+    cursor = conn.cursor()
+    weights = ", ".join(str(w) for w in SEARCH_WEIGHTS)
+    where, params = _search_filter(match, journalist_id, start, end)
+    sql = f'''
+    SELECT a.rowid, a.id, a.title, a.url, a.published_date, a.published_ts, a.char_count, a.keywords, a.journalist_id,
+           bm25(articles_fts, {weights}) AS rank
+    FROM articles_fts
+    JOIN articles a ON a.rowid = articles_fts.rowid
+    WHERE {where}
+    '''
+    sql += " ORDER BY rank LIMIT ?"
+    params.append(limit)
+    
+    cursor.execute(sql, params)
+    columns = [col[0] for col in cursor.description][1:]
+    rows = cursor.fetchall()
+    if not rows:
+        return []
+    
+    rowids = [row[0] for row in rows]
+    cursor.execute(f'''
+    SELECT rowid, title, description, article_text(content, content_z), keywords
+    FROM articles WHERE rowid IN ({','.join('?' * len(rowids))})
+    ''', rowids)
+    fields = {row[0]: row[1:] for row in cursor.fetchall()}
+    hits = []
+    for row in rows:
+        hit = dict(zip(columns, row[1:]))
+        hit['snippet'] = _snippet(fields.get(row[0], ()), query)
+        hits.append(hit)
+    return hits
+
+def _fill_search_index(cursor):
+    cursor.execute("INSERT INTO articles_fts (articles_fts) VALUES ('delete-all')")
+    cursor.execute('''
+    INSERT INTO articles_fts (rowid, title, description, content, keywords)
+    SELECT rowid, title, description, article_text(content, content_z), keywords
+    FROM articles
+    ''')
+
+def _compressed_search_rows(cursor, article_ids):
+    """
+    Returns the indexed values, (rowid, id, title, description, text,
+    keywords), of those of the given articles whose bodies are compressed.
+    """
+    rows = []
+    for i in range(0, len(article_ids), 500):
+        chunk = article_ids[i:i + 500]
+        cursor.execute(f'''
+        SELECT rowid, id, title, description, article_text(content, content_z), keywords
+        FROM articles
+        WHERE id IN ({','.join('?' * len(chunk))}) AND content_z IS NOT NULL
+        ''', chunk)
+        rows += cursor.fetchall()
+    return rows
+
+def _search_index_delete(cursor, rows):
+    """
+    Removes articles from the search index, given the values they were
+    indexed with: (rowid, title, description, text, keywords) or rows of
+    _compressed_search_rows.
+    """
+    cursor.executemany('''
+    INSERT INTO articles_fts (articles_fts, rowid, title, description, content, keywords)
+    VALUES ('delete', ?, ?, ?, ?, ?)
+    ''', [(row[0], *row[-4:]) for row in rows])
+
+def _search_index_insert(cursor, rows):
+    """Adds (rowid, title, description, text, keywords) rows to the search index."""
+    cursor.executemany('''
+    INSERT INTO articles_fts (rowid, title, description, content, keywords)
+    VALUES (?, ?, ?, ?, ?)
+    ''', rows)
+
+def _index_compressed_content(cursor, rows):
+    """Indexes the articles of update_articles_full_data rows whose bodies were stored compressed."""
+    by_id = {r['id']: r for r in rows}
+    ids = list(by_id)
+    index_rows = []
+    for i in range(0, len(ids), 500):
+        chunk = ids[i:i + 500]
+        cursor.execute(f'''
+        SELECT rowid, id, title FROM articles
+        WHERE id IN ({','.join('?' * len(chunk))}) AND content_z IS NOT NULL
+        ''', chunk)
+        for rowid, a_id, title in cursor.fetchall():
+            r = by_id[a_id]
+            index_rows.append((rowid, title, r['description'], r['content'], r['keywords']))
+    _search_index_insert(cursor, index_rows)
+
+def rebuild_search_index():
+    """Rebuilds the full-text index from the articles table."""
+    conn = get_db_connection()
+    _fill_search_index(conn.cursor())
+    conn.commit()
+
 def create_journalist(j_id, j_name):
     conn = get_db_connection()
     cursor = conn.cursor()
@@ -112,4 +1127,184 @@ def create_journalist(j_id, j_name):
     VALUES (?, ?, ?)
     ''', (j_id, j_name, f"https://yle.fi/p/{j_id}/fi"))
     conn.commit()
-    conn.close()
\ No newline at end of file
+
+# --- Journalist stats ---
+
+def _rebuild_journalist_stats(cursor):
+    cursor.execute('''
+    INSERT INTO journalist_stats (journalist_id, article_count, total_chars, content_count, latest_ts, version)
+    SELECT journalist_id, COUNT(*), COALESCE(SUM(char_count), 0), COUNT(NULLIF(char_count, 0)), MAX(published_ts), 1
+    FROM articles
+    WHERE journalist_id IS NOT NULL
+    GROUP BY journalist_id
+    ON CONFLICT (journalist_id) DO UPDATE SET
+        article_count = excluded.article_count,
+        total_chars = excluded.total_chars,
+        content_count = excluded.content_count,
+        latest_ts = excluded.latest_ts,
+        version = version + 1
+    ''')
+    # journalists whose articles are all gone
+    cursor.execute('''
+    UPDATE journalist_stats
+    SET article_count = 0, total_chars = 0, content_count = 0, latest_ts = NULL, version = version + 1
+    WHERE article_count != 0
+      AND journalist_id NOT IN (SELECT DISTINCT journalist_id FROM articles WHERE journalist_id IS NOT NULL)
+    ''')
+
+def rebuild_journalist_stats():
+    """Recomputes journalist_stats from scratch, in case it ever drifts from the articles table."""
+    conn = get_db_connection()
+    _rebuild_journalist_stats(conn.cursor())
+    conn.commit()
+
+def get_journalist_stats(journalist_id=None):
+    """
+    Returns every journalist (or one) with article_count, avg_chars,
+    latest_ts and version, read from the journalist_stats table.
+    """
+    conn = get_read_connection()
+    cursor = conn.cursor()
+    sql = '''
+    SELECT j.id, j.name,
+           COALESCE(s.article_count, 0),
+           CASE WHEN s.content_count > 0 THEN s.total_chars * 1.0 / s.content_count END,
+           s.latest_ts,
+           COALESCE(s.version, 0)
+    FROM journalists j
+    LEFT JOIN journalist_stats s ON s.journalist_id = j.id
+    '''
+    if journalist_id:
+        cursor.execute(sql + " WHERE j.id = ?", (journalist_id,))
+    else:
+        cursor.execute(sql + " ORDER BY j.rowid")
+    return [{
+        "id": row[0],
+        "name": row[1],
+        "article_count": row[2],
+        "avg_chars": row[3],
+        "latest_ts": row[4],
+        "version": row[5],
+    } for row in cursor.fetchall()]
+
+def get_journalists_version():
+    """
+    Change token for the journalist list: moves whenever any journalist's
+    articles change. Pair it with each journalist's own `version` to
+    invalidate caches per journalist.
+    """
+    conn = get_read_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*), COALESCE(SUM(version), 0) FROM journalist_stats")
+    return tuple(cursor.fetchone())
+
+# --- Scrape jobs ---
+
+SCRAPE_JOB_FIELDS = [
+    "id", "journalist_id", "max_articles", "incremental", "status",
+    "feed_depth", "feed_card_offset", "feed_done", "articles_discovered",
+    "details_completed", "details_failed", "last_error", "created_at", "updated_at"
+]
+
+def create_scrape_job(journalist_id, max_articles, incremental=False, status='running'):
+    """
+    Records a new scrape run. max_articles=None (or inf) means no limit.
+    Jobs handed to a background worker start as status='queued'.
+    Returns the job ID.
+    """
+    if max_articles is not None and max_articles == float('inf'):
+        max_articles = None
+    now = time.time()
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+    INSERT INTO scrape_jobs (journalist_id, max_articles, incremental, status, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ''', (journalist_id, max_articles, int(incremental), status, now, now))
+    job_id = cursor.lastrowid
+    conn.commit()
+    return job_id
+
+def update_scrape_job(job_id, **fields):
+    """Sets the given columns of a scrape job, e.g. status='completed' or feed_depth=3."""
+    columns = [name for name in fields if name in SCRAPE_JOB_FIELDS and name != "id"]
+    if not columns:
+        return
+    assignments = ", ".join(f"{name} = ?" for name in columns)
+    params = [fields[name] for name in columns] + [time.time(), job_id]
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"UPDATE scrape_jobs SET {assignments}, updated_at = ? WHERE id = ?", params)
+    conn.commit()
+
+def add_scrape_job_articles(job_id, article_ids):
+    """Records article IDs discovered by a job's feed scrape."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.executemany(
+        "INSERT OR IGNORE INTO scrape_job_articles (job_id, article_id) VALUES (?, ?)",
+        [(job_id, a_id) for a_id in article_ids]
+    )
+    cursor.execute('''
+    UPDATE scrape_jobs
+    SET articles_discovered = (SELECT COUNT(*) FROM scrape_job_articles WHERE job_id = ?),
+        updated_at = ?
+    WHERE id = ?
+    ''', (job_id, time.time(), job_id))
+    conn.commit()
+
+def increment_scrape_job_details(job_id, completed=0, failed=0):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+    UPDATE scrape_jobs
+    SET details_completed = details_completed + ?,
+        details_failed = details_failed + ?,
+        updated_at = ?
+    WHERE id = ?
+    ''', (completed, failed, time.time(), job_id))
+    conn.commit()
+
+def get_scrape_job(job_id):
+    """Returns a scrape job as a dict (plus its discovered article IDs), or None."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT {', '.join(SCRAPE_JOB_FIELDS)} FROM scrape_jobs WHERE id = ?", (job_id,))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    job = dict(zip(SCRAPE_JOB_FIELDS, row))
+    cursor.execute("SELECT article_id FROM scrape_job_articles WHERE job_id = ?", (job_id,))
+    job['article_ids'] = {r[0] for r in cursor.fetchall()}
+    return job
+
+def get_recent_scrape_jobs(within_seconds=1800, limit=10):
+    """
+    Returns the jobs updated in the last `within_seconds`, newest first,
+    with the journalist's name when it is known. Cheap enough to poll.
+    """
+    conn = get_read_connection()
+    cursor = conn.cursor()
+    fields = ", ".join(f"s.{field}" for field in SCRAPE_JOB_FIELDS)
+    cursor.execute(f'''
+    SELECT {fields}, j.name
+    FROM scrape_jobs s
+    LEFT JOIN journalists j ON j.id = s.journalist_id
+    WHERE s.updated_at > ?
+    ORDER BY s.id DESC
+    LIMIT ?
+    ''', (time.time() - within_seconds, limit))
+    return [dict(zip(SCRAPE_JOB_FIELDS + ["journalist_name"], row)) for row in cursor.fetchall()]
+
+def get_latest_unfinished_job(journalist_id=None):
+    """Returns the newest job that did not complete, optionally for one journalist."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    query = "SELECT id FROM scrape_jobs WHERE status != 'completed'"
+    params = []
+    if journalist_id:
+        query += " AND journalist_id = ?"
+        params.append(journalist_id)
+    cursor.execute(query + " ORDER BY id DESC LIMIT 1", params)
+    row = cursor.fetchone()
+    return get_scrape_job(row[0]) if row else None
@@ -0,0 +1,221 @@
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from src.config import SCRAPER_SETTINGS
+from src.scraper import fetch_yle_article_details
+
+class TokenBucket:
+    """Thread-safe token bucket. Refills `rate` tokens per second up to `capacity`."""
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a token is available and takes it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_time = (1 - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+class HostRateLimiter:
+    """Keeps one token bucket per host so every site gets its own request budget."""
+    def __init__(self, rate=None, capacity=None):
+        self.rate = rate or SCRAPER_SETTINGS['requests_per_second']
+        self.capacity = capacity or SCRAPER_SETTINGS['burst']
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, url):
+        host = urlparse(url).netloc
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.capacity)
+                self.buckets[host] = bucket
+        bucket.acquire()
+
+class SharedTokenBucket:
+    """
+    Token bucket whose state lives in shared memory, so every worker
+    process draws from the same budget. Create it in the parent process
+    and hand it to the workers (e.g. through a pool initializer).
+    """
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        # [tokens, updated_at]; wall clock because it is compared across processes
+        self.state = multiprocessing.Array('d', [self.capacity, time.time()])
+
+    def acquire(self):
+        while True:
+            with self.state.get_lock():
+                now = time.time()
+                tokens = min(self.capacity, self.state[0] + (now - self.state[1]) * self.rate)
+                self.state[1] = now
+                if tokens >= 1:
+                    self.state[0] = tokens - 1
+                    return
+                self.state[0] = tokens
+                wait_time = (1 - tokens) / self.rate
+            time.sleep(wait_time)
+
+class SharedHostRateLimiter(HostRateLimiter):
+    """
+    Per-host limiter for multi-process scraping: the listed hosts share one
+    budget across all processes, any other host gets a local bucket.
+    """
+    def __init__(self, hosts=None, rate=None, capacity=None):
+        super().__init__(rate, capacity)
+        hosts = hosts or SCRAPER_SETTINGS['shared_rate_hosts']
+        self.shared_buckets = {host: SharedTokenBucket(self.rate, self.capacity) for host in hosts}
+
+    def __getstate__(self):
+        # the lock and local buckets are per process, only shared buckets travel
+        return {"rate": self.rate, "capacity": self.capacity, "shared_buckets": self.shared_buckets}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, url):
+        host = urlparse(url).netloc
+        for shared_host, bucket in self.shared_buckets.items():
+            if host == shared_host or host.endswith("." + shared_host):
+                bucket.acquire()
+                return
+        super().acquire(url)
+
+_default_rate_limiter = None
+
+def set_default_rate_limiter(rate_limiter):
+    """Makes every fetch in this process use the given limiter (e.g. a shared one)."""
+    global _default_rate_limiter
+    _default_rate_limiter = rate_limiter
+
+def fetch_articles_concurrently(articles, on_result, workers=None, rate_limiter=None):
+    """
+    Fetches article details with a bounded thread pool.
+    `articles` can be any iterable of {"id", "url"} dicts, including a
+    slow generator; at most `workers * 2` fetches are queued at once.
+    `on_result(article, data, error, done_count)` is called in the calling
+    thread as each fetch completes (data is None and error is set when the
+    fetch failed), so database writes stay single-threaded.
+    Returns the number of completed fetches.
+    """
+    workers = workers or SCRAPER_SETTINGS['fetch_workers']
+    rate_limiter = rate_limiter or _default_rate_limiter or HostRateLimiter()
+    results = queue.Queue()
+    slots = threading.Semaphore(workers * 2)
+    feeding_done = object()
+
+    def fetch(article):
+        rate_limiter.acquire(article['url'])
+        return fetch_yle_article_details(article['url'], raise_errors=True)
+
+    def feed_pool(executor):
+        # submits from a separate thread so a slow `articles` iterable
+        # never delays handling of fetches that already finished
+        submitted = 0
+        try:
+            for article in articles:
+                slots.acquire()
+                future = executor.submit(fetch, article)
+                future.add_done_callback(lambda f, a=article: results.put((a, f)))
+                submitted += 1
+        except Exception as e:
+            # fetches already submitted are still handled before re-raising
+            results.put((feeding_done, (submitted, e)))
+            return
+        results.put((feeding_done, (submitted, None)))
+
+    done_count = 0
+    submitted = None
+    error = None
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        feeder = threading.Thread(target=feed_pool, args=(executor,), name="fetch-feeder", daemon=True)
+        feeder.start()
+
+        while submitted is None or done_count < submitted:
+            article, outcome = results.get()
+            if article is feeding_done:
+                submitted, error = outcome
+                continue
+
+            slots.release()
+            data, fetch_error = None, None
+            try:
+                data = outcome.result()
+            except Exception as e:
+                print(f"Error fetching {article['url']}: {e}")
+                fetch_error = e
+            done_count += 1
+            on_result(article, data, fetch_error, done_count)
+
+    feeder.join()
+    if error:
+        raise error
+    return done_count
+
+def pipeline_feed(feed, save_batch, queue_size=None):
+    """
+    Runs the feed scrape in a background thread and yields articles for
+    detail fetching as soon as their batch has been saved.
+    `save_batch(batch)` stores a batch and returns the articles to fetch.
+    The queue is bounded, so the feed pauses while the fetchers catch up.
+    """
+    queue_size = queue_size or SCRAPER_SETTINGS['pipeline_queue_size']
+    work = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    done = object()
+    errors = []
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                work.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for batch in feed:
+                for article in save_batch(batch):
+                    if not put(article):
+                        return
+        except Exception as e:
+            errors.append(e)
+        finally:
+            # closes the Selenium driver if we stopped early
+            feed.close()
+            put(done)
+
+    producer = threading.Thread(target=produce, name="feed-producer", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = work.get()
+            if item is done:
+                break
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+    if errors:
+        raise errors[0]
@@ -0,0 +1,151 @@
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from src.config import HTML_CACHE_DIR, SCRAPER_SETTINGS
+
+class HTMLCache:
+    """
+    On-disk cache of raw article HTML.
+    Pages are stored under the SHA-256 of their URL, together with the
+    ETag/Last-Modified validators needed for conditional requests.
+    A small SQLite index tracks sizes and access times for LRU eviction.
+    """
+    def __init__(self, cache_dir=HTML_CACHE_DIR, max_bytes=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes or SCRAPER_SETTINGS['html_cache_max_mb'] * 1024 * 1024
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.lock = threading.Lock()
+        # timeout: several scraper processes may share the same cache
+        self.conn = sqlite3.connect(os.path.join(cache_dir, 'index.db'), timeout=30, check_same_thread=False)
+        # the index is rebuildable bookkeeping: no fsync per commit
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.touch_interval = SCRAPER_SETTINGS['html_cache_touch_seconds']
+        self.conn.execute('''
+        CREATE TABLE IF NOT EXISTS pages (
+            key TEXT PRIMARY KEY,
+            url TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            size INTEGER,
+            fetched_at REAL,
+            accessed_at REAL
+        )
+        ''')
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages (accessed_at)")
+        self.conn.commit()
+
+    @staticmethod
+    def key_for(url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _path_for(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.html")
+
+    def get(self, url):
+        """Returns {"html", "etag", "last_modified"} for a cached URL, or None."""
+        key = self.key_for(url)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, accessed_at FROM pages WHERE key = ?", (key,)
+            ).fetchone()
+        if not row:
+            return None
+        try:
+            with open(self._path_for(key), encoding='utf-8') as f:
+                html = f.read()
+        except (OSError, UnicodeDecodeError):
+            # index and files got out of sync, forget the entry
+            with self.lock:
+                self.conn.execute("DELETE FROM pages WHERE key = ?", (key,))
+                self.conn.commit()
+            return None
+        # LRU order only needs coarse access times, so a hit only writes
+        # when the stored time is older than html_cache_touch_seconds
+        now = time.time()
+        if now - (row[2] or 0) > self.touch_interval:
+            with self.lock:
+                self.conn.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (now, key))
+                self.conn.commit()
+        return {"html": html, "etag": row[0], "last_modified": row[1]}
+
+    def put(self, url, html, etag=None, last_modified=None):
+        key = self.key_for(url)
+        path = self._path_for(key)
+        data = html.encode('utf-8')
+        now = time.time()
+        with self.lock:
+            self._write_file(path, data)
+            self.conn.execute('''
+            INSERT OR REPLACE INTO pages (key, url, etag, last_modified, size, fetched_at, accessed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (key, url, etag, last_modified, len(data), now, now))
+            self.conn.commit()
+            self._evict()
+
+    @staticmethod
+    def _write_file(path, data):
+        # get() reads pages without the lock, and other scraper processes
+        # share the directory: write a temp file and swap it in, so a
+        # reader sees the old page or the new one, never a partial one
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def touch(self, url):
+        """Marks a cached page as fresh after a 304 Not Modified."""
+        with self.lock:
+            now = time.time()
+            self.conn.execute(
+                "UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, self.key_for(url))
+            )
+            self.conn.commit()
+
+    def _evict(self):
+        """Drops least recently used pages until the cache fits in max_bytes."""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self.conn.execute("SELECT key, size FROM pages ORDER BY accessed_at").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._path_for(key))
+            except OSError:
+                pass
+            self.conn.execute("DELETE FROM pages WHERE key = ?", (key,))
+            total -= size
+        self.conn.commit()
+
+    def get_stats(self):
+        with self.lock:
+            count, size = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages").fetchone()
+        return {"pages": count, "bytes": size, "max_bytes": self.max_bytes}
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_html_cache():
+    """Returns the process-wide HTML cache, creating it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HTMLCache()
+        return _cache
@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.config import SCRAPER_SETTINGS
+
+# urllib3 only decodes brotli responses when a brotli package is installed,
+# so only advertise it when we can actually read it.
+try:
+    import brotli # type: ignore # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept-Encoding": ACCEPT_ENCODING,
+}
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class ScraperHTTPClient:
+    """
+    Shared HTTP client for the scraper.
+    Owns a keep-alive connection pool, retries 429/5xx responses with
+    exponential backoff and keeps timing counters for every request.
+    """
+    def __init__(self, pool_size=None, retries=None, backoff=None, timeout=None):
+        pool_size = pool_size or SCRAPER_SETTINGS['http_pool_size']
+        retries = SCRAPER_SETTINGS['http_retries'] if retries is None else retries
+        backoff = SCRAPER_SETTINGS['http_backoff'] if backoff is None else backoff
+        self.timeout = timeout or SCRAPER_SETTINGS['http_timeout']
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+            pool_block=True,
+        )
+
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.lock = threading.Lock()
+        self.reset_stats()
+
+    def get(self, url, **kwargs):
+        """GET through the pooled session. Records timing for every call."""
+        kwargs.setdefault("timeout", self.timeout)
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, **kwargs)
+        except Exception:
+            self._record(url, None, time.perf_counter() - start, 0)
+            raise
+        self._record(url, response.status_code, time.perf_counter() - start, len(response.content))
+        return response
+
+    def _record(self, url, status, elapsed, size):
+        with self.lock:
+            self.stats['requests'] += 1
+            self.stats['total_time'] += elapsed
+            self.stats['max_time'] = max(self.stats['max_time'], elapsed)
+            self.stats['bytes'] += size
+            if status is None or status >= 400:
+                self.stats['errors'] += 1
+            self.recent.append({"url": url, "status": status, "elapsed": elapsed, "bytes": size})
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats = {"requests": 0, "errors": 0, "total_time": 0.0, "max_time": 0.0, "bytes": 0}
+            self.recent = deque(maxlen=100)
+
+    def get_stats(self):
+        """Returns aggregate counters plus the timings of the most recent requests."""
+        with self.lock:
+            stats = dict(self.stats)
+            stats['avg_time'] = stats['total_time'] / stats['requests'] if stats['requests'] else 0.0
+            stats['recent'] = list(self.recent)
+        return stats
+
+    def close(self):
+        self.session.close()
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_http_client():
+    """Returns the process-wide scraper HTTP client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ScraperHTTPClient()
+        return _client
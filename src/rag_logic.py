@@ -1,4 +1,3 @@
-import sqlite3
 import os
 import shutil
 from typing import List, Dict, Any
@@ -13,7 +12,7 @@ from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import RunnablePassthrough
 import pandas as pd
 
-from src.config import DB_PATH
+from src.database import get_read_connection
 from src.rag_config import (
     VECTOR_DB_DIR, 
     RAG_SETTINGS, 
@@ -39,11 +38,10 @@ class RAGIngestion:
         )
 
     def fetch_articles_from_db(self, journalist_id: str) -> pd.DataFrame:
-        conn = sqlite3.connect(DB_PATH)
-        query = "SELECT id, title, content, url, published_date FROM articles WHERE journalist_id = ?"
-        df = pd.read_sql_query(query, conn, params=(journalist_id,))
-        conn.close()
-        return df
+        conn = get_read_connection()
+        # article_text() decompresses the body if it is stored compressed
+        query = "SELECT id, title, article_text(content, content_z) AS content, url, published_date FROM articles WHERE journalist_id = ?"
+        return pd.read_sql_query(query, conn, params=(journalist_id,))
 
     def ingest_journalist_data(self, journalist_id: str):
         print(f"Starting ingestion for Journalist ID: {journalist_id}")
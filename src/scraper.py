@@ -1,32 +1,139 @@
 import time
 from bs4 import BeautifulSoup
+from bs4.filter import ElementFilter
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
-import requests
+from src.config import SCRAPER_SETTINGS
+from src.http_client import get_http_client
+from src.html_cache import get_html_cache
 
-def get_driver():
+def get_driver(headless=False):
     """Initializes and returns a Chrome driver."""
     options = webdriver.ChromeOptions()
-    # options.add_argument("--headless") # Keep commented out for debugging
+    if headless: # Keep off when debugging
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
     driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
     return driver
 
-def scrape_profile_feed_generator(profile_id, max_articles=10):
+# Returns the feed cards from index arguments[0] onwards, so each batch only
+# serializes what "Näytä lisää" appended instead of the whole page source.
+# The feed is the list (<ul>/<ol>) holding most of the cards, so card links
+# elsewhere on the page (recommendations etc.) are never mixed in. It is
+# kept in window.__feedCards with how many of its children were read; the
+# next call only looks at the children appended since, so a batch costs the
+# same however long the feed already is. A fresh page (first call, resumed
+# job) or a re-rendered feed locates the feed again. arguments[1] (rescan)
+# returns every card on the page instead, as a fallback when the feed
+# could not be located correctly.
+NEW_CARDS_SCRIPT = """
+const SELECTOR = 'a[data-card-heading-content-id]';
+const offset = arguments[0];
+const rescan = arguments[1];
+const state = rescan ? null : window.__feedCards;
+let feed, cards, total;
+if (rescan) {
+    cards = Array.from(document.querySelectorAll(SELECTOR));
+    total = cards.length;
+    feed = null;
+} else if (state && state.total === offset && state.feed.isConnected
+           && state.items <= state.feed.children.length) {
+    feed = state.feed;
+    cards = [];
+    for (let i = state.items; i < feed.children.length; i++) {
+        const child = feed.children[i];
+        if (child.matches(SELECTOR)) {
+            cards.push(child);
+        }
+        cards.push(...child.querySelectorAll(SELECTOR));
+    }
+    total = offset + cards.length;
+} else {
+    const counts = new Map();
+    for (const card of document.querySelectorAll(SELECTOR)) {
+        const list = card.closest('ul, ol') || document.body;
+        counts.set(list, (counts.get(list) || 0) + 1);
+    }
+    feed = null;
+    for (const [list, count] of counts) {
+        if (!feed || count > counts.get(feed)) {
+            feed = list;
+        }
+    }
+    const all = feed ? Array.from(feed.querySelectorAll(SELECTOR)) : [];
+    cards = all.slice(offset <= all.length ? offset : 0);
+    total = all.length;
+}
+window.__feedCards = feed ? {feed: feed, items: feed.children.length, total: total} : null;
+return {
+    total: total,
+    cards: cards.map(card => [card.getAttribute('data-card-heading-content-id'), card.textContent])
+};
+"""
+
+def extract_new_feed_cards(driver, offset=0, rescan=False):
+    """
+    Returns ([(article_id, title), ...], new_offset) for the cards added
+    to the feed after `offset`. Only the new cards are looked up in the
+    browser, serialized and handled in Python (see NEW_CARDS_SCRIPT).
+    If the feed was re-rendered with fewer cards, it rescans from the top.
+    rescan=True returns every card on the page; callers drop the ones
+    they have already seen.
+    """
+    result = driver.execute_script(NEW_CARDS_SCRIPT, offset, rescan) or {}
+    cards = [(a_id, (title or "").strip()) for a_id, title in result.get('cards', [])]
+    return cards, result.get('total', offset)
+
+def click_show_more(driver):
+    """Clicks the feed's "Näytä lisää" button. Returns False at the end of the list."""
+    try:
+        load_more = WebDriverWait(driver, 2).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, 'button[aria-label="Näytä lisää"]'))
+        )
+        
+        if load_more.is_displayed():
+            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", load_more)
+            time.sleep(0.5)
+            driver.execute_script("arguments[0].click();", load_more)
+            time.sleep(0.5) # Give it a moment to load
+            return True
+        else:
+            print("Scraper: Button found but not visible. End of list.")
+            return False
+    except Exception:
+        print("Scraper: No more buttons found. End of list.")
+        return False
+
+def scrape_profile_feed_generator(profile_id, max_articles=10, known_ids=None, stop_after_known=None,
+                                  checkpoint=None, on_checkpoint=None, headless=False):
     """
     Yields batches of articles from the profile.
     Stops when max_articles is reached or no more buttons exist.
+    Incremental mode: articles in `known_ids` are skipped, and pagination
+    stops after `stop_after_known` consecutive already-known cards.
+    Resuming: `checkpoint` ({"depth", "card_offset", "article_ids"}) replays
+    the clicks without re-reading cards, and `on_checkpoint(depth, card_offset)`
+    is called once each yielded batch has been handled by the caller.
     """
     url = f"https://yle.fi/p/{profile_id}/fi"
-    driver = get_driver()
+    driver = get_driver(headless=headless)
     
     # We use a set to keep track of IDs we have already yielded
-    # to avoid duplicates when we re-parse the page after clicking.
-    processed_ids = set()
-    total_yielded = 0
+    # to avoid duplicates if the feed gets re-rendered after clicking.
+    checkpoint = checkpoint or {}
+    processed_ids = set(checkpoint.get('article_ids', ()))
+    total_yielded = len(processed_ids)
+    card_offset = checkpoint.get('card_offset', 0)
+    depth = 0
+    
+    known_ids = known_ids or set()
+    consecutive_known = 0
+    reached_known = False
+    clicked = False
     
     try:
         print(f"Opening profile: {url}")
@@ -42,20 +149,38 @@ def scrape_profile_feed_generator(profile_id, max_articles=10):
         except:
             pass
 
+        # Fast-forward to the checkpoint: replay the clicks, skip the reading
+        if checkpoint.get('depth'):
+            print(f"Scraper: Resuming at page depth {checkpoint['depth']} ({total_yielded} articles already found).")
+            while depth < checkpoint['depth'] and click_show_more(driver):
+                depth += 1
+
         # Main Scraping Loop
         while total_yielded < max_articles:
-            # A. Parse the current state of the page
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            links = soup.find_all('a', attrs={"data-card-heading-content-id": True})
+            # A. Read only the cards appended since the last batch
+            cards, card_offset = extract_new_feed_cards(driver, card_offset)
+            if clicked and not cards:
+                # the click loaded nothing where the feed was expected to
+                # grow: read the whole page, processed_ids skips old cards
+                print("Scraper: No new cards in the feed list, rescanning the page.")
+                cards, card_offset = extract_new_feed_cards(driver, card_offset, rescan=True)
             
             new_articles = []
-            for link in links:
-                a_id = link['data-card-heading-content-id']
-                
+            for a_id, a_name in cards:
                 # If we haven't seen this article yet, let's process it
                 if a_id not in processed_ids:
-                    # Parse article details
-                    a_name = link.get_text().strip()
+                    # Incremental mode: the feed is newest first, so a run of
+                    # known cards means the rest of the history is already saved
+                    if a_id in known_ids:
+                        processed_ids.add(a_id)
+                        consecutive_known += 1
+                        if stop_after_known and consecutive_known >= stop_after_known:
+                            reached_known = True
+                            break
+                        continue
+                    consecutive_known = 0
+                    
+                    # Build article details
                     a_url = f"https://yle.fi/a/{a_id}"
                     
                     # Store to avoid re-yielding later
@@ -80,25 +205,21 @@ def scrape_profile_feed_generator(profile_id, max_articles=10):
                 print(f"Scraper: Found {len(new_articles)} new articles.")
                 yield new_articles
             
+            # the caller has saved everything up to here
+            if on_checkpoint:
+                on_checkpoint(depth, card_offset)
+            
+            if reached_known:
+                print(f"Scraper: Hit {consecutive_known} already known articles in a row. Stopping.")
+                break
+            
             # check if we need to click "Show More"
             if total_yielded < max_articles:
                 print("Scraper: Need more articles. Looking for button...")
-                try:
-                    load_more = WebDriverWait(driver, 2).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, 'button[aria-label="Näytä lisää"]'))
-                    )
-                    
-                    if load_more.is_displayed():
-                        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", load_more)
-                        time.sleep(0.5)
-                        driver.execute_script("arguments[0].click();", load_more)
-                        time.sleep(0.5) # Give it a moment to load
-                    else:
-                        print("Scraper: Button found but not visible. End of list.")
-                        break
-                except Exception:
-                    print("Scraper: No more buttons found. End of list.")
+                if not click_show_more(driver):
                     break
+                clicked = True
+                depth += 1
             else:
                 print("Scraper: Reached max article limit.")
                 break
@@ -106,64 +227,142 @@ def scrape_profile_feed_generator(profile_id, max_articles=10):
     finally:
         driver.quit()
 
-def fetch_yle_article_details(url):
+def fetch_article_html(url, offline=False):
     """
-    Fetches content, description, keywords and published time.
+    Returns the raw HTML of an article page.
+    Cached pages are revalidated with If-None-Match/If-Modified-Since,
+    so unchanged articles cost a 304 instead of a full download.
+    With offline=True only the cache is consulted (no network I/O).
     """
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
+    use_cache = SCRAPER_SETTINGS['html_cache']
+    cached = get_html_cache().get(url) if use_cache or offline else None
+
+    if offline:
+        return cached['html'] if cached else None
+
+    headers = {}
+    if cached:
+        if cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+        if cached['last_modified']:
+            headers['If-Modified-Since'] = cached['last_modified']
+
+    response = get_http_client().get(url, headers=headers)
+    if response.status_code == 304 and cached:
+        get_html_cache().touch(url)
+        return cached['html']
+    response.raise_for_status()
+
+    if use_cache:
+        get_html_cache().put(
+            url,
+            response.text,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified')
+        )
+    return response.text
+
+class ArticlePartsFilter(ElementFilter):
+    """
+    Parse-time filter: only builds <meta> tags and the containers the
+    article body can live in. Everything else is tokenized but never
+    turned into a tree, which is where most of the parsing time goes.
+    """
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        if name in ("meta", "main"):
+            return True
+        if name in ("section", "div"):
+            classes = (attrs or {}).get("class", "")
+            if isinstance(classes, str):
+                classes = classes.split()
+            return "yle__article__content" in classes
+        return False
+
+    def allow_string_creation(self, string):
+        return False
+
+# backend name -> (BeautifulSoup parser, parse_only filter)
+PARSER_BACKENDS = {
+    "html.parser": ("html.parser", None),
+    "html.parser-strained": ("html.parser", ArticlePartsFilter()),
+    "lxml": ("lxml", None),
+    "lxml-strained": ("lxml", ArticlePartsFilter()),
+}
+
+def parse_article_html(html, backend=None):
+    """
+    Extracts content, description, keywords and published time from an article page.
+    `backend` is one of PARSER_BACKENDS (defaults to SCRAPER_SETTINGS['parser_backend']).
+    Returns None if the page has no article body.
+    """
+    backend = backend or SCRAPER_SETTINGS['parser_backend']
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend: {backend}")
+    features, parse_only = PARSER_BACKENDS[backend]
+    soup = BeautifulSoup(html, features, parse_only=parse_only)
     
-    try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # METADATA
-        description = ""
-        keywords = ""
-        published_time = None
+    # METADATA
+    description = ""
+    keywords = ""
+    published_time = None
+    
+    # Description
+    meta_desc = soup.find("meta", attrs={"name": "description"})
+    if meta_desc: description = meta_desc.get("content", "")
         
-        # Description
-        meta_desc = soup.find("meta", attrs={"name": "description"})
-        if meta_desc: description = meta_desc.get("content", "")
-            
-        # Keywords
-        meta_keys = soup.find("meta", attrs={"name": "keywords"})
-        if meta_keys: keywords = meta_keys.get("content", "")
-            
-        # Published Time
-        # <meta property="article:published_time" content="...">
-        meta_time = soup.find("meta", property="article:published_time")
-        if meta_time:
-            published_time = meta_time.get("content", "")
-
-        # BODY CONTENT
-        content_text = ""
-        content_div = soup.find('section', class_='yle__article__content')
-        if not content_div: content_div = soup.find('div', class_='yle__article__content')
-        if not content_div: content_div = soup.find('main')
-
-        if content_div:
-            text_blocks = []
-            for element in content_div.find_all(['p', 'h2', 'h3']):
-                txt = element.get_text().strip()
-                if txt:
-                    text_blocks.append(txt)
-            content_text = "\n\n".join(text_blocks)
+    # Keywords
+    meta_keys = soup.find("meta", attrs={"name": "keywords"})
+    if meta_keys: keywords = meta_keys.get("content", "")
         
-        if content_text:
-            return {
-                "content": content_text,
-                "description": description,
-                "keywords": keywords,
-                "published_date": published_time 
-            }
-        else:
-            return None
+    # Published Time
+    # <meta property="article:published_time" content="...">
+    meta_time = soup.find("meta", property="article:published_time")
+    if meta_time:
+        published_time = meta_time.get("content", "")
+
+    # BODY CONTENT
+    content_text = ""
+    content_div = soup.find('section', class_='yle__article__content')
+    if not content_div: content_div = soup.find('div', class_='yle__article__content')
+    if not content_div: content_div = soup.find('main')
+
+    if content_div:
+        text_blocks = []
+        for element in content_div.find_all(['p', 'h2', 'h3']):
+            txt = element.get_text().strip()
+            if txt:
+                text_blocks.append(txt)
+        content_text = "\n\n".join(text_blocks)
+    
+    if content_text:
+        return {
+            "content": content_text,
+            "description": description,
+            "keywords": keywords,
+            "published_date": published_time 
+        }
+    else:
+        return None
+
+def fetch_yle_article_details(url, offline=False, raise_errors=False):
+    """
+    Fetches content, description, keywords and published time.
+    With offline=True the article is re-parsed from the HTML cache only.
+    With raise_errors=True failures raise instead of returning None, so the
+    caller can record why a fetch failed.
+    """
+    try:
+        html = fetch_article_html(url, offline=offline)
+        if html is None:
+            raise LookupError("Page not in HTML cache")
+        data = parse_article_html(html)
+        if data is None:
+            raise ValueError("No article content found")
+        return data
 
     except Exception as e:
+        if raise_errors:
+            raise
         print(f"Error fetching {url}: {e}")
         return None
     
@@ -173,12 +372,9 @@ def scrape_journalist_name(profile_id):
     Expected format in <h1>: "Profiili: Firstname Lastname"
     """
     url = f"https://yle.fi/p/{profile_id}/fi"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = get_http_client().get(url)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, 'html.parser')
         